@@ -0,0 +1,35 @@
+# Production server settings, used as `gunicorn project.server:app -c gunicorn.conf.py`.
+import os
+import sys
+
+# The config is loaded before gunicorn puts the working directory on the path.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from project.cpu_quota import available_cpus  # noqa: E402
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Every worker runs its own Prisma query engine and media process pool, so
+# the default follows the container's CPU quota rather than the host's
+# cores, and stays small enough for a 512M instance.
+workers = int(os.environ.get("WEB_CONCURRENCY", min(available_cpus(), 2)))
+
+# Lets each worker size its media process pool to its share of the CPUs.
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# UvicornWorker picks uvloop and httptools automatically when they are installed.
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master and fork the workers from it, so the
+# service modules and generated Prisma client are loaded once per container
+# rather than once per worker. Database connections are opened per worker
+# in the app's lifespan, after the fork.
+preload_app = True
+
+timeout = int(os.environ.get("WORKER_TIMEOUT", "60"))
+
+graceful_timeout = 30
+
+keepalive = 5
+
+accesslog = "-"
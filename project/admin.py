@@ -0,0 +1,28 @@
+import hmac
+import os
+from typing import Optional
+
+import project.errors
+
+# PROFILE_ADMIN_TOKEN is the name the token had when only profiling used it.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN") or os.environ.get("PROFILE_ADMIN_TOKEN")
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """
+    Checks a token against `ADMIN_TOKEN`. Always false when no admin token is configured.
+    """
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def require_admin(token: Optional[str]) -> None:
+    """
+    Rejects callers that do not present the admin token in `X-Admin-Token`.
+
+    Raises:
+        ForbiddenError: If the token is missing or wrong, or no admin token is configured.
+    """
+    if not is_admin(token):
+        raise project.errors.ForbiddenError("Admin token required.")
@@ -0,0 +1,223 @@
+import asyncio
+import gzip
+import logging
+import os
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, List, Optional
+
+import prisma
+import prisma.models
+from pydantic import BaseModel
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+AUDIT_SINK = os.environ.get("AUDIT_SINK", "postgres")
+
+AUDIT_BUFFER_SIZE = int(os.environ.get("AUDIT_BUFFER_SIZE", "10000"))
+
+AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", "500"))
+
+AUDIT_FLUSH_SECONDS = float(os.environ.get("AUDIT_FLUSH_SECONDS", "1.0"))
+
+AUDIT_DIR = Path(os.environ.get("AUDIT_DIR", "audit"))
+
+AUDIT_FILE_MAX_BYTES = int(os.environ.get("AUDIT_FILE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+AUDIT_FILE_BACKUPS = int(os.environ.get("AUDIT_FILE_BACKUPS", "10"))
+
+current_actor: ContextVar[Optional[str]] = ContextVar("current_actor", default=None)
+
+current_client_ip: ContextVar[Optional[str]] = ContextVar(
+    "current_client_ip", default=None
+)
+
+
+class AuditEntry(BaseModel):
+    """
+    A single audited write: who did what to which record, and when.
+    """
+
+    action: str
+    entity: str
+    entityId: str
+    actor: Optional[str] = None
+    clientIp: Optional[str] = None
+    occurredAt: datetime
+
+
+class AuditContextMiddleware:
+    """
+    Captures the acting user (from the `X-User-Id` header) and client address of each request for the audit entries recorded while it is handled.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        actor = dict(scope["headers"]).get(b"x-user-id")
+        client = scope.get("client")
+        actor_token = current_actor.set(actor.decode("latin-1") if actor else None)
+        ip_token = current_client_ip.set(client[0] if client else None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_actor.reset(actor_token)
+            current_client_ip.reset(ip_token)
+
+
+class _RotatingGzipWriter:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.path: Optional[Path] = None
+
+    def _rotate(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        self.path = self.directory / f"audit-{stamp}-{os.getpid()}.jsonl.gz"
+        # Prune across every pid, so files left by restarted workers are
+        # removed too; the timestamp prefix orders them oldest first. The
+        # limit therefore covers all workers together.
+        backups = sorted(self.directory.glob("audit-*.jsonl.gz"))
+        for stale in backups[: max(len(backups) - AUDIT_FILE_BACKUPS, 0)]:
+            stale.unlink(missing_ok=True)
+
+    def write(self, entries: List[AuditEntry]) -> None:
+        # Another worker may have pruned the current file.
+        if (
+            self.path is None
+            or not self.path.exists()
+            or self.path.stat().st_size >= AUDIT_FILE_MAX_BYTES
+        ):
+            self._rotate()
+        # Each batch is appended as its own gzip member; readers such as
+        # zcat and gzip.open treat the concatenation as one stream.
+        with gzip.open(self.path, "at", encoding="utf-8") as handle:
+            handle.writelines(entry.json() + "\n" for entry in entries)
+
+
+class AuditLog:
+    """
+    Bounded in-memory buffer of audit entries, drained in batches by a background task.
+
+    Recording never waits on I/O. When the buffer is full the oldest entry is discarded and counted in `dropped`, so memory stays bounded even if the sink is down.
+    """
+
+    def __init__(self, sink: str) -> None:
+        self.sink = sink
+        self.dropped = 0
+        self.flushed = 0
+        self._buffer: Deque[AuditEntry] = deque(maxlen=AUDIT_BUFFER_SIZE)
+        self._recent: Deque[AuditEntry] = deque(maxlen=1000)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self._writer = _RotatingGzipWriter(AUDIT_DIR) if sink == "file" else None
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    def record(self, action: str, entity: str, entityId: str) -> None:
+        """
+        Queues an audit entry for the current request.
+
+        Args:
+            action (str): What happened, `created`, `updated` or `deleted`.
+            entity (str): The kind of record affected, `event` or `media`.
+            entityId (str): Identifier of the affected record.
+        """
+        entry = AuditEntry(
+            action=action,
+            entity=entity,
+            entityId=entityId,
+            actor=current_actor.get(),
+            clientIp=current_client_ip.get(),
+            occurredAt=datetime.now(timezone.utc),
+        )
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(entry)
+        self._recent.append(entry)
+        if len(self._buffer) >= AUDIT_BATCH_SIZE:
+            self._wakeup.set()
+
+    def recent(
+        self, limit: int, entity: Optional[str] = None, entityId: Optional[str] = None
+    ) -> List[AuditEntry]:
+        """
+        Returns the most recent entries recorded by this worker, newest first.
+        """
+        matches = [
+            entry
+            for entry in reversed(self._recent)
+            if (not entity or entry.entity == entity)
+            and (not entityId or entry.entityId == entityId)
+        ]
+        return matches[:limit]
+
+    async def _write(self, batch: List[AuditEntry]) -> None:
+        if self._writer is not None:
+            await asyncio.to_thread(self._writer.write, batch)
+            return
+        await prisma.models.AuditEntry.prisma().create_many(
+            data=[entry.dict() for entry in batch]
+        )
+
+    async def flush(self) -> None:
+        """
+        Writes everything buffered so far to the sink, one batch at a time.
+        """
+        while self._buffer:
+            batch = [
+                self._buffer.popleft()
+                for _ in range(min(AUDIT_BATCH_SIZE, len(self._buffer)))
+            ]
+            try:
+                await self._write(batch)
+            except Exception:
+                logger.exception("Failed to write %d audit entries", len(batch))
+                # Put the batch back for the next attempt, as far as the
+                # buffer has room; whatever does not fit is counted as lost.
+                lost = max(len(batch) - (self._buffer.maxlen - len(self._buffer)), 0)
+                self.dropped += lost
+                self._buffer.extendleft(reversed(batch[lost:]))
+                return
+            self.flushed += len(batch)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), AUDIT_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """
+        Starts the background flush task.
+        """
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background flush task and writes out whatever is still buffered.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+audit_log = AuditLog(AUDIT_SINK)
@@ -0,0 +1,176 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+
+import prisma
+import prisma.models
+import project.audit_log
+import project.change_feed
+import project.errors
+import project.media_storage
+import project.tombstones
+import project.user_counts
+from pydantic import BaseModel
+
+BULK_DELETE_BATCH_SIZE = int(os.environ.get("BULK_DELETE_BATCH_SIZE", "500"))
+
+# Locks the batch's events until the transaction ends. Rows deleted by a
+# concurrent delete in the meantime are skipped, so tombstones and creator
+# counts follow what this transaction actually deletes. Locking in id order
+# keeps overlapping batches from deadlocking.
+_LOCK_EVENTS = """
+SELECT "id", "createdBy" FROM "Event"
+WHERE "id" = ANY($1::text[])
+ORDER BY "id"
+FOR UPDATE
+"""
+
+_LOCK_MEDIA = """
+SELECT "id" FROM "Media" WHERE "id" = ANY($1::text[]) ORDER BY "id" FOR UPDATE
+"""
+
+
+class EventSelection(BaseModel):
+    """
+    Selects the events to delete, either by id or by filter. Criteria are combined, so `createdBy` together with `olderThan` selects a creator's old events.
+    """
+
+    ids: Optional[List[str]] = None
+    olderThan: Optional[datetime] = None
+    createdBy: Optional[str] = None
+
+    def where(self) -> Dict[str, Any]:
+        where: Dict[str, Any] = {}
+        if self.ids is not None:
+            where["id"] = {"in": self.ids}
+        if self.olderThan is not None:
+            where["date"] = {"lt": self.olderThan}
+        if self.createdBy is not None:
+            where["createdBy"] = self.createdBy
+        if not where:
+            raise project.errors.DomainError(
+                "Select events by ids, olderThan or createdBy."
+            )
+        return where
+
+
+class DeletedCounts(BaseModel):
+    """
+    The number of events and media items removed by a bulk delete.
+    """
+
+    events: int = 0
+    media: int = 0
+
+
+async def delete_event_batch(eventIds: List[str]) -> DeletedCounts:
+    """
+    Deletes a batch of events, and through the cascade their media, in one short transaction.
+
+    Tombstones for the events and their media are written in the same transaction. After it commits, stored blobs no longer referenced by any media item are removed and the deletions are announced on the change feed and audit log.
+
+    Args:
+        eventIds (List[str]): Identifiers of the events to delete.
+
+    Returns:
+        DeletedCounts: The number of events and media items removed.
+    """
+    async with prisma.get_client().tx() as transaction:
+        events = await transaction.query_raw(_LOCK_EVENTS, eventIds)
+        eventIds = [event["id"] for event in events]
+        media = await prisma.models.Media.prisma(transaction).find_many(
+            where={"eventId": {"in": eventIds}}
+        )
+        deleted = await prisma.models.Event.prisma(transaction).delete_many(
+            where={"id": {"in": eventIds}}
+        )
+        await _record_media_tombstones(transaction, media)
+        await project.tombstones.record_tombstones(transaction, "event", eventIds)
+        await project.user_counts.adjust_event_counts(
+            transaction, [event["createdBy"] for event in events], -1
+        )
+    await project.media_storage.remove_unreferenced(item.storageKey for item in media)
+    await project.change_feed.record_changes("event", "deleted", eventIds)
+    for eventId in eventIds:
+        project.audit_log.audit_log.record("deleted", "event", eventId)
+    return DeletedCounts(events=deleted, media=len(media))
+
+
+async def delete_media_batch(mediaIds: List[str]) -> DeletedCounts:
+    """
+    Deletes a batch of media items in one short transaction, recording their tombstones alongside.
+
+    Args:
+        mediaIds (List[str]): Identifiers of the media items to delete.
+
+    Returns:
+        DeletedCounts: The number of media items removed.
+    """
+    async with prisma.get_client().tx() as transaction:
+        locked = await transaction.query_raw(_LOCK_MEDIA, mediaIds)
+        media = await prisma.models.Media.prisma(transaction).find_many(
+            where={"id": {"in": [row["id"] for row in locked]}}
+        )
+        deleted = await prisma.models.Media.prisma(transaction).delete_many(
+            where={"id": {"in": [item.id for item in media]}}
+        )
+        await _record_media_tombstones(transaction, media)
+    await project.media_storage.remove_unreferenced(item.storageKey for item in media)
+    await project.change_feed.record_changes(
+        "media",
+        "deleted",
+        [item.id for item in media],
+        [item.eventId for item in media],
+    )
+    for item in media:
+        project.audit_log.audit_log.record("deleted", "media", item.id)
+    return DeletedCounts(media=deleted)
+
+
+async def _record_media_tombstones(
+    transaction: prisma.Prisma, media: List[prisma.models.Media]
+) -> None:
+    by_event = defaultdict(list)
+    for item in media:
+        by_event[item.eventId].append(item.id)
+    for eventId, mediaIds in by_event.items():
+        await project.tombstones.record_tombstones(
+            transaction, "media", mediaIds, eventId
+        )
+
+
+async def delete_events(
+    selection: EventSelection,
+    pause: float = 0,
+    on_batch: Optional[Callable[[DeletedCounts], Coroutine[Any, Any, None]]] = None,
+) -> DeletedCounts:
+    """
+    Deletes every event matching the selection, one batch of `BULK_DELETE_BATCH_SIZE` at a time.
+
+    Each batch commits on its own so no transaction holds row locks for long; `pause` adds a delay between batches to throttle background purges.
+
+    Args:
+        selection (EventSelection): The events to delete.
+        pause (float): Seconds to wait between batches.
+        on_batch (Optional[Callable]): Awaited with the running totals after each batch.
+
+    Returns:
+        DeletedCounts: The total number of events and media items removed.
+    """
+    where = selection.where()
+    totals = DeletedCounts()
+    while True:
+        events = await prisma.models.Event.prisma().find_many(
+            where=where, take=BULK_DELETE_BATCH_SIZE
+        )
+        if not events:
+            return totals
+        counts = await delete_event_batch([event.id for event in events])
+        totals.events += counts.events
+        totals.media += counts.media
+        if on_batch is not None:
+            await on_batch(totals)
+        if pause:
+            await asyncio.sleep(pause)
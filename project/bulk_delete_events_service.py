@@ -0,0 +1,40 @@
+from typing import Optional
+
+import project.admin
+import project.bulk_delete
+from pydantic import BaseModel
+
+
+class BulkDeleteEventsResponse(BaseModel):
+    """
+    Reports how many events, and media items attached to them, were removed.
+    """
+
+    success: bool
+    eventsDeleted: int
+    mediaDeleted: int
+
+
+async def bulk_delete_events(
+    adminToken: Optional[str], selection: project.bulk_delete.EventSelection
+) -> BulkDeleteEventsResponse:
+    """
+    Endpoint for deleting many events at once, by id list or by filter. Admin only.
+
+    Events are removed in batched transactions with `delete_many`; for selections too large to wait for, use the background purge instead.
+
+    Args:
+        adminToken (Optional[str]): The `X-Admin-Token` header of the request.
+        selection (project.bulk_delete.EventSelection): The events to delete, by ids, `olderThan` date and/or `createdBy` user.
+
+    Returns:
+        BulkDeleteEventsResponse: Reports how many events, and media items attached to them, were removed.
+
+    Raises:
+        ForbiddenError: If the admin token is missing or wrong.
+    """
+    project.admin.require_admin(adminToken)
+    counts = await project.bulk_delete.delete_events(selection)
+    return BulkDeleteEventsResponse(
+        success=True, eventsDeleted=counts.events, mediaDeleted=counts.media
+    )
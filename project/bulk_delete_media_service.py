@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+import project.admin
+import project.bulk_delete
+from pydantic import BaseModel
+
+
+class BulkDeleteMediaResponse(BaseModel):
+    """
+    Reports how many of the requested media items were removed.
+    """
+
+    success: bool
+    mediaDeleted: int
+
+
+async def bulk_delete_media(
+    adminToken: Optional[str], mediaIds: List[str]
+) -> BulkDeleteMediaResponse:
+    """
+    Endpoint for deleting many media items at once. Admin only.
+
+    Args:
+        adminToken (Optional[str]): The `X-Admin-Token` header of the request.
+        mediaIds (List[str]): Identifiers of the media items to delete. Unknown identifiers are ignored.
+
+    Returns:
+        BulkDeleteMediaResponse: Reports how many of the requested media items were removed.
+
+    Raises:
+        ForbiddenError: If the admin token is missing or wrong.
+    """
+    project.admin.require_admin(adminToken)
+    deleted = 0
+    batch_size = project.bulk_delete.BULK_DELETE_BATCH_SIZE
+    for start in range(0, len(mediaIds), batch_size):
+        counts = await project.bulk_delete.delete_media_batch(
+            mediaIds[start : start + batch_size]
+        )
+        deleted += counts.media
+    return BulkDeleteMediaResponse(success=True, mediaDeleted=deleted)
@@ -0,0 +1,291 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Deque, List, Optional, Set
+
+import prisma
+import prisma.models
+import project.database_url
+import project.errors
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+CHANGE_CHANNEL = "xpyvent_changes"
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+RECENT_CHANGES = 1024
+
+CHANGE_RETENTION = timedelta(days=float(os.environ.get("CHANGE_RETENTION_DAYS", "7")))
+
+# Sequence numbers are assigned when a change is inserted, not when it
+# commits, so a lower number can become visible after a higher one. A
+# resuming client is sent the changes numbered below its cursor that were
+# created this close to it once more; see `late_changes`.
+RESUME_OVERLAP = timedelta(seconds=5)
+
+PRUNE_BATCH_SIZE = 1000
+
+_INSERT_CHANGES = """
+INSERT INTO "ChangeEvent" ("entity", "action", "entityId", "parentId")
+SELECT $1, $2, change.entity_id, change.parent_id
+FROM unnest($3::text[], $4::text[]) AS change (entity_id, parent_id)
+RETURNING "seq", "entity", "action", "entityId", "parentId", "createdAt"
+"""
+
+# The newest change is always kept, so the oldest remaining sequence number
+# tells how far back a cursor can resume.
+_PRUNE_CHANGES = """
+DELETE FROM "ChangeEvent" WHERE "seq" IN (
+    SELECT "seq" FROM "ChangeEvent"
+    WHERE "createdAt" < $1 AND "seq" < (SELECT max("seq") FROM "ChangeEvent")
+    LIMIT $2
+)
+"""
+
+_NOTIFY_CHANGES = "SELECT pg_notify($1, payload) FROM unnest($2::text[]) AS payload"
+
+
+class Change(BaseModel):
+    """
+    A committed write to an event or media item, as delivered on the change feed.
+    """
+
+    seq: int
+    entity: str
+    action: str
+    entityId: str
+    parentId: Optional[str] = None
+    createdAt: datetime
+
+
+class ChangeHub:
+    """
+    In-process fan-out of changes to the open feed subscriptions of this worker.
+
+    Changes arrive both from local writes and from the Postgres `LISTEN` connection, which echoes our own notifications back, so recently seen sequence numbers are remembered and delivered once. A subscriber whose queue fills up is sent `None` and dropped; it is expected to reconnect and resume from its last sequence number.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._recent: Deque[int] = deque(maxlen=RECENT_CHANGES)
+        self._seen: Set[int] = set()
+
+    def publish(self, change: Change) -> None:
+        if change.seq in self._seen:
+            return
+        if len(self._recent) == self._recent.maxlen:
+            self._seen.discard(self._recent[0])
+        self._recent.append(change.seq)
+        self._seen.add(change.seq)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(change)
+            except asyncio.QueueFull:
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+
+hub = ChangeHub()
+
+_listener: Optional[asyncio.Task] = None
+
+
+async def record_change(
+    entity: str, action: str, entityId: str, parentId: Optional[str] = None
+) -> None:
+    """
+    Appends a committed write to the change log and announces it to every worker.
+
+    The change log row assigns the global sequence number that clients resume from. Failures are logged rather than raised so that a feed outage never fails the write that triggered it.
+
+    Args:
+        entity (str): The kind of record that changed, `event` or `media`.
+        action (str): What happened to it, `created`, `updated` or `deleted`.
+        entityId (str): Identifier of the record that changed.
+        parentId (Optional[str]): Identifier of the owning event for media changes.
+    """
+    try:
+        row = await prisma.models.ChangeEvent.prisma().create(
+            data={
+                "entity": entity,
+                "action": action,
+                "entityId": entityId,
+                "parentId": parentId,
+            }
+        )
+        change = Change(**row.dict())
+        hub.publish(change)
+        await prisma.get_client().execute_raw(
+            "SELECT pg_notify($1, $2)", CHANGE_CHANNEL, change.json()
+        )
+    except Exception:
+        logger.exception("Failed to record %s %s change for %s", entity, action, entityId)
+
+
+async def record_changes(
+    entity: str,
+    action: str,
+    entityIds: List[str],
+    parentIds: Optional[List[Optional[str]]] = None,
+) -> None:
+    """
+    Appends the same change for many records, such as a bulk delete, in one round trip.
+
+    Args:
+        entity (str): The kind of record that changed, `event` or `media`.
+        action (str): What happened to the records.
+        entityIds (List[str]): Identifiers of the records that changed.
+        parentIds (Optional[List[Optional[str]]]): Identifier of the owning event of each record, for media changes.
+    """
+    if not entityIds:
+        return
+    if parentIds is None:
+        parentIds = [None] * len(entityIds)
+    try:
+        client = prisma.get_client()
+        rows = await client.query_raw(
+            _INSERT_CHANGES, entity, action, entityIds, parentIds
+        )
+        changes = [Change(**row) for row in rows]
+        for change in changes:
+            hub.publish(change)
+        await client.execute_raw(
+            _NOTIFY_CHANGES, CHANGE_CHANNEL, [change.json() for change in changes]
+        )
+    except Exception:
+        logger.exception(
+            "Failed to record %s %s changes for %d records", entity, action, len(entityIds)
+        )
+
+
+async def changes_since(seq: int, limit: int = 1000) -> List[Change]:
+    """
+    Reads changes numbered after the given sequence number from the change log.
+    """
+    rows = await prisma.models.ChangeEvent.prisma().find_many(
+        where={"seq": {"gt": seq}}, order={"seq": "asc"}, take=limit
+    )
+    return [Change(**row.dict()) for row in rows]
+
+
+async def late_changes(seq: int) -> List[Change]:
+    """
+    Reads the changes numbered below `seq` that were created within `RESUME_OVERLAP` of it.
+
+    These may have committed after the client saw `seq`, so a resuming client is sent them again. Delivery is therefore at least once: clients must ignore a sequence number they have already applied.
+    """
+    anchor = await prisma.models.ChangeEvent.prisma().find_unique(where={"seq": seq})
+    if anchor is None:
+        return []
+    rows = await prisma.models.ChangeEvent.prisma().find_many(
+        where={
+            "seq": {"lt": seq},
+            "createdAt": {"gte": anchor.createdAt - RESUME_OVERLAP},
+        },
+        order={"seq": "asc"},
+    )
+    return [Change(**row.dict()) for row in rows]
+
+
+async def ensure_resumable(seq: int) -> None:
+    """
+    Checks that no change after `seq` has been pruned from the change log.
+
+    Raises:
+        GoneError: If the cursor is older than `CHANGE_RETENTION`.
+    """
+    oldest = await prisma.models.ChangeEvent.prisma().find_first(order={"seq": "asc"})
+    if oldest is not None and seq < oldest.seq - 1:
+        raise project.errors.GoneError(
+            "Cursor is older than the retained change history; reload and stream without it."
+        )
+
+
+async def prune_changes(before: datetime) -> int:
+    """
+    Deletes changes created before `before`, a batch at a time, keeping the newest one.
+
+    Returns:
+        int: The number of changes deleted.
+    """
+    deleted = 0
+    while True:
+        count = await prisma.get_client().execute_raw(
+            _PRUNE_CHANGES, before, PRUNE_BATCH_SIZE
+        )
+        deleted += count
+        if count < PRUNE_BATCH_SIZE:
+            return deleted
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    try:
+        hub.publish(Change(**json.loads(payload)))
+    except Exception:
+        logger.exception("Ignoring malformed change notification")
+
+
+async def _listen() -> None:
+    import asyncpg
+
+    dsn = project.database_url.asyncpg_dsn()
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(CHANGE_CHANNEL, _on_notification)
+            await lost.wait()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Change feed listener failed, reconnecting")
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(1)
+
+
+def start_listener() -> None:
+    """
+    Starts relaying change notifications from other workers, when asyncpg is installed.
+    """
+    global _listener
+    try:
+        import asyncpg  # noqa: F401
+    except ImportError:
+        logger.warning("asyncpg is not installed, change feed is local to this worker")
+        return
+    _listener = asyncio.create_task(_listen())
+
+
+async def stop_listener() -> None:
+    """
+    Stops the notification relay started by `start_listener`.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.cancel()
+    try:
+        await _listener
+    except asyncio.CancelledError:
+        pass
+    _listener = None
@@ -0,0 +1,34 @@
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def available_cpus() -> int:
+    """
+    Returns the number of CPUs this process may actually use.
+
+    `os.cpu_count()` reports the host's cores, which inside a container is usually far more than its quota. The cgroup CPU quota (v2 `cpu.max`, or v1 `cpu.cfs_quota_us` over `cpu.cfs_period_us`) is honoured when set, as is the process's CPU affinity.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_quota()
+    if quota is not None:
+        cpus = min(cpus, max(math.ceil(quota), 1))
+    return max(cpus, 1)
+
+
+def _cgroup_quota() -> Optional[float]:
+    try:
+        limit, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        return None if limit == "max" else int(limit) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        limit = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        return None if limit <= 0 else limit / period
+    except (OSError, ValueError):
+        return None
@@ -3,6 +3,9 @@ from typing import List, Optional
 
 import prisma
 import prisma.models
+import project.audit_log
+import project.change_feed
+import project.user_counts
 from pydantic import BaseModel
 
 
@@ -32,9 +35,9 @@ async def create_event(
     Returns:
     CreateEventResponse: The output model providing feedback after attempting to create a new event.
     """
-    try:
-        user_id = "placeholder_user_id"
-        event = await prisma.models.Event.prisma().create(
+    user_id = "placeholder_user_id"
+    async with prisma.get_client().tx() as transaction:
+        event = await prisma.models.Event.prisma(transaction).create(
             data={
                 "title": title,
                 "description": description,
@@ -44,10 +47,11 @@ async def create_event(
                 "Media": {"create": [{"url": url, "type": "IMAGE"} for url in media]},
             }
         )
-        return CreateEventResponse(
-            success=True, event_id=event.id, message="Event created successfully."
-        )
-    except Exception as e:
-        return CreateEventResponse(
-            success=False, message="Failed to create event due to an internal error."
+        await project.user_counts.adjust_event_counts(
+            transaction, [event.createdBy], 1
         )
+    await project.change_feed.record_change("event", "created", event.id)
+    project.audit_log.audit_log.record("created", "event", event.id)
+    return CreateEventResponse(
+        success=True, event_id=event.id, message="Event created successfully."
+    )
@@ -3,6 +3,7 @@ from typing import Dict, Optional
 import bcrypt
 import prisma
 import prisma.models
+import project.errors
 from pydantic import BaseModel
 
 
@@ -31,15 +32,16 @@ async def create_user(
 
     Returns:
     CreateUserResponse: A model that provides feedback to the client regarding the outcome of the account creation attempt. It may include successful account creation acknowledgment or error details.
+
+    Raises:
+    ConflictError: If the email address is already associated with another account.
     """
     existing_user = await prisma.models.User.prisma().find_unique(
         where={"email": email}
     )
     if existing_user:
-        return CreateUserResponse(
-            success=False,
-            message="Email already in use",
-            errors={"email": "This email is already associated with another account."},
+        raise project.errors.ConflictError(
+            "This email is already associated with another account."
         )
     hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
     user = await prisma.models.User.prisma().create(
@@ -0,0 +1,35 @@
+import os
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Connection string parameters only the Prisma query engine understands.
+# asyncpg would forward them to the server as settings and fail to connect.
+PRISMA_PARAMETERS = frozenset(
+    {
+        "connection_limit",
+        "pgbouncer",
+        "pool_timeout",
+        "schema",
+        "socket_timeout",
+        "sslaccept",
+        "sslidentity",
+        "sslpassword",
+        "statement_cache_size",
+    }
+)
+
+
+def asyncpg_dsn(url: Optional[str] = None) -> str:
+    """
+    Turns the Prisma `DATABASE_URL` into a DSN for direct asyncpg connections.
+
+    Prisma-only parameters are dropped and `schema` becomes the `search_path` setting; everything else, such as `sslmode` or a `host=/cloudsql/...` socket directory, is kept.
+    """
+    parts = urlsplit(url if url is not None else os.environ["DATABASE_URL"])
+    query = []
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        if name == "schema":
+            query.append(("search_path", value))
+        elif name not in PRISMA_PARAMETERS:
+            query.append((name, value))
+    return urlunsplit(parts._replace(query=urlencode(query)))
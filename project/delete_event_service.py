@@ -1,5 +1,11 @@
 import prisma
 import prisma.models
+import project.audit_log
+import project.change_feed
+import project.errors
+import project.media_storage
+import project.tombstones
+import project.user_counts
 from pydantic import BaseModel
 
 
@@ -21,13 +27,30 @@ async def delete_event(eventId: str) -> DeleteEventResponse:
 
     Returns:
         DeleteEventResponse: This model communicates the result of a delete event attempt, indicating success or failure with an appropriate message.
+
+    Raises:
+        NotFoundError: If no event with the given `eventId` exists.
     """
-    event = await prisma.models.Event.prisma().delete(where={"id": eventId})
-    if event:
-        return DeleteEventResponse(
-            success=True, message="prisma.models.Event successfully deleted."
+    async with prisma.get_client().tx() as transaction:
+        media = await prisma.models.Media.prisma(transaction).find_many(
+            where={"eventId": eventId}
         )
-    else:
-        return DeleteEventResponse(
-            success=False, message="Failed to delete the event. It may not exist."
+        event = await prisma.models.Event.prisma(transaction).delete(
+            where={"id": eventId}
         )
+        if event:
+            await project.tombstones.record_tombstones(
+                transaction, "media", [item.id for item in media], eventId
+            )
+            await project.tombstones.record_tombstones(transaction, "event", [eventId])
+            await project.user_counts.adjust_event_counts(
+                transaction, [event.createdBy], -1
+            )
+    if not event:
+        raise project.errors.NotFoundError(f"Event with id {eventId} not found.")
+    await project.media_storage.remove_unreferenced(item.storageKey for item in media)
+    await project.change_feed.record_change("event", "deleted", eventId)
+    project.audit_log.audit_log.record("deleted", "event", eventId)
+    return DeleteEventResponse(
+        success=True, message="prisma.models.Event successfully deleted."
+    )
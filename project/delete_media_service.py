@@ -1,5 +1,10 @@
 import prisma
 import prisma.models
+import project.audit_log
+import project.change_feed
+import project.errors
+import project.media_storage
+import project.tombstones
 from pydantic import BaseModel
 
 
@@ -26,17 +31,21 @@ async def delete_media(mediaId: str) -> DeleteMediaResponse:
         mediaId = 'cuid123'
         response = await delete_media(mediaId)
         > DeleteMediaResponse(success=True, message='Media deleted successfully.')
+
+    Raises:
+    NotFoundError: If no media item with the given `mediaId` exists.
     """
-    try:
-        media = await prisma.models.Media.prisma().find_unique(where={"id": mediaId})
+    async with prisma.get_client().tx() as transaction:
+        media = await prisma.models.Media.prisma(transaction).delete(
+            where={"id": mediaId}
+        )
         if media:
-            await prisma.models.Media.prisma().delete(where={"id": mediaId})
-            return DeleteMediaResponse(
-                success=True, message="Media deleted successfully."
+            await project.tombstones.record_tombstones(
+                transaction, "media", [mediaId], media.eventId
             )
-        else:
-            return DeleteMediaResponse(success=False, message="Media not found.")
-    except Exception as e:
-        return DeleteMediaResponse(
-            success=False, message=f"An error occurred: {str(e)}"
-        )
+    if not media:
+        raise project.errors.NotFoundError("Media not found.")
+    await project.media_storage.remove_unreferenced([media.storageKey])
+    await project.change_feed.record_change("media", "deleted", mediaId, media.eventId)
+    project.audit_log.audit_log.record("deleted", "media", mediaId)
+    return DeleteMediaResponse(success=True, message="Media deleted successfully.")
@@ -0,0 +1,99 @@
+import logging
+import os
+import random
+from typing import Callable, Coroutine
+
+import prisma.errors
+import project.errors
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Fraction of unexpected errors logged with a full traceback; the rest get a
+# one-line summary so that a burst of failures cannot flood the logs.
+TRACEBACK_SAMPLE_RATE = float(os.environ.get("TRACEBACK_SAMPLE_RATE", "0.1"))
+
+_EXPECTED_ERRORS = (
+    project.errors.DomainError,
+    prisma.errors.RecordNotFoundError,
+    prisma.errors.UniqueViolationError,
+    HTTPException,
+    RequestValidationError,
+)
+
+
+def _error_response(message: str, status_code: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+async def handle_domain_error(
+    request: Request, exc: project.errors.DomainError
+) -> JSONResponse:
+    return _error_response(str(exc), exc.status_code)
+
+
+async def handle_record_not_found(
+    request: Request, exc: prisma.errors.RecordNotFoundError
+) -> JSONResponse:
+    return _error_response(str(exc), 404)
+
+
+async def handle_unique_violation(
+    request: Request, exc: prisma.errors.UniqueViolationError
+) -> JSONResponse:
+    return _error_response(str(exc), 409)
+
+
+def handle_unexpected_error(request: Request, exc: Exception) -> JSONResponse:
+    if random.random() < TRACEBACK_SAMPLE_RATE:
+        logger.error(
+            "Error processing %s %s", request.method, request.url.path, exc_info=exc
+        )
+    else:
+        logger.error(
+            "Error processing %s %s: %s: %s",
+            request.method,
+            request.url.path,
+            type(exc).__name__,
+            exc,
+        )
+    return _error_response(str(exc), 500)
+
+
+class ServiceRoute(APIRoute):
+    """
+    Route class that turns unexpected errors raised by a handler into a 500 response with sampled traceback logging.
+
+    Starlette's catch-all `Exception` handler re-raises after responding, so the server would log every traceback anyway; catching here avoids that. Expected errors are passed on to the handlers registered by `register_error_handlers`.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def handle(request: Request) -> Response:
+            try:
+                return await route_handler(request)
+            except _EXPECTED_ERRORS:
+                raise
+            except Exception as exc:
+                return handle_unexpected_error(request, exc)
+
+        return handle
+
+
+def register_error_handlers(app: FastAPI) -> None:
+    """
+    Maps domain and Prisma errors to cheap 404/409 responses and installs `ServiceRoute` for routes added afterwards.
+    """
+    app.router.route_class = ServiceRoute
+    app.add_exception_handler(project.errors.DomainError, handle_domain_error)
+    app.add_exception_handler(
+        prisma.errors.RecordNotFoundError, handle_record_not_found
+    )
+    app.add_exception_handler(
+        prisma.errors.UniqueViolationError, handle_unique_violation
+    )
@@ -0,0 +1,38 @@
+class DomainError(Exception):
+    """
+    Base class for expected failures that map to a client error response. They are answered without logging a traceback.
+    """
+
+    status_code = 400
+
+
+class NotFoundError(DomainError, LookupError):
+    """
+    Raised when the requested record does not exist.
+    """
+
+    status_code = 404
+
+
+class ConflictError(DomainError):
+    """
+    Raised when a write conflicts with the current state, such as a duplicate unique value.
+    """
+
+    status_code = 409
+
+
+class ForbiddenError(DomainError):
+    """
+    Raised when the caller is not allowed to perform the request.
+    """
+
+    status_code = 403
+
+
+class GoneError(DomainError):
+    """
+    Raised when a resume cursor or sync watermark is older than the retained history, so the client has to start over.
+    """
+
+    status_code = 410
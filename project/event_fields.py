@@ -0,0 +1,89 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import prisma
+import prisma.models
+import project.errors
+from pydantic import BaseModel
+
+EVENT_FIELDS = ("id", "title", "description", "date", "location")
+
+EVENT_INCLUDES = ("media", "media.variants")
+
+
+class EventFieldSelection(BaseModel):
+    """
+    The sparse fieldset requested for events, such as `?fields=id,title,date&include=media`.
+
+    Only the selected columns are read from the database and only the included relations are loaded, so unrequested data is neither fetched nor serialized. `id` is always returned. Without either parameter the full event is returned, media and variants included.
+    """
+
+    fields: List[str] = list(EVENT_FIELDS)
+    media: bool = True
+    variants: bool = True
+
+    @classmethod
+    def parse(
+        cls, fields: Optional[str] = None, include: Optional[str] = None
+    ) -> "EventFieldSelection":
+        """
+        Builds a selection from the comma-separated `fields` and `include` query parameters.
+
+        Raises:
+            DomainError: If a field or relation is unknown.
+        """
+        if fields is None and include is None:
+            return cls()
+        selected = _split(fields, EVENT_FIELDS) if fields is not None else EVENT_FIELDS
+        included = _split(include, EVENT_INCLUDES) if include is not None else []
+        return cls(
+            fields=[field for field in EVENT_FIELDS if field == "id" or field in selected],
+            media=bool(included),
+            variants="media.variants" in included,
+        )
+
+
+def _split(value: str, allowed: tuple) -> List[str]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise project.errors.DomainError(
+            f"Unknown {', '.join(unknown)}; choose from {', '.join(allowed)}."
+        )
+    return names
+
+
+async def select_events(
+    selection: EventFieldSelection, eventId: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Reads the selected columns of every event, or of the one event with `eventId`.
+
+    The column list is built from `EVENT_FIELDS` only, never from client input directly.
+    """
+    columns = ", ".join(f'"{field}"' for field in selection.fields)
+    if eventId is None:
+        return await prisma.get_client().query_raw(f'SELECT {columns} FROM "Event"')
+    return await prisma.get_client().query_raw(
+        f'SELECT {columns} FROM "Event" WHERE "id" = $1', eventId
+    )
+
+
+async def load_media(
+    selection: EventFieldSelection, eventIds: List[str]
+) -> Dict[str, List[prisma.models.Media]]:
+    """
+    Loads the media of the given events, with their variants if selected, grouped by event.
+
+    Nothing is queried when media was not requested.
+    """
+    by_event: Dict[str, List[prisma.models.Media]] = defaultdict(list)
+    if not selection.media or not eventIds:
+        return by_event
+    media = await prisma.models.Media.prisma().find_many(
+        where={"eventId": {"in": eventIds}},
+        include={"Variants": True} if selection.variants else None,
+    )
+    for item in media:
+        by_event[item.eventId].append(item)
+    return by_event
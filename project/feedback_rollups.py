@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timezone
+
+import prisma
+import prisma.enums
+import prisma.models
+
+_INCREMENT_BUCKETS = """
+INSERT INTO "FeedbackRollup" ("granularity", "bucket", "anonymousCount", "identifiedCount")
+VALUES
+    ('HOUR'::"RollupGranularity", $1::timestamp(3), $3, $4),
+    ('DAY'::"RollupGranularity", $2::timestamp(3), $3, $4)
+ON CONFLICT ("granularity", "bucket") DO UPDATE SET
+    "anonymousCount" = "FeedbackRollup"."anonymousCount" + EXCLUDED."anonymousCount",
+    "identifiedCount" = "FeedbackRollup"."identifiedCount" + EXCLUDED."identifiedCount"
+"""
+
+_INCREMENT_USER = """
+INSERT INTO "FeedbackUserRollup" ("userId", "count", "lastFeedbackAt")
+VALUES ($1, 1, $2::timestamp(3))
+ON CONFLICT ("userId") DO UPDATE SET
+    "count" = "FeedbackUserRollup"."count" + 1,
+    "lastFeedbackAt" = GREATEST("FeedbackUserRollup"."lastFeedbackAt", EXCLUDED."lastFeedbackAt")
+"""
+
+_REBUILD = [
+    'DELETE FROM "FeedbackRollup"',
+    'DELETE FROM "FeedbackUserRollup"',
+    """
+    INSERT INTO "FeedbackRollup" ("granularity", "bucket", "anonymousCount", "identifiedCount")
+    SELECT granularity::"RollupGranularity", date_trunc(lower(granularity), "createdAt"),
+        count(*) FILTER (WHERE "userId" IS NULL),
+        count(*) FILTER (WHERE "userId" IS NOT NULL)
+    FROM "Feedback" CROSS JOIN (VALUES ('HOUR'), ('DAY')) AS g (granularity)
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO "FeedbackUserRollup" ("userId", "count", "lastFeedbackAt")
+    SELECT "userId", count(*), max("createdAt")
+    FROM "Feedback"
+    WHERE "userId" IS NOT NULL
+    GROUP BY 1
+    """,
+]
+
+
+def bucket_start(
+    moment: datetime, granularity: prisma.enums.RollupGranularity
+) -> datetime:
+    """
+    Truncates a timestamp to the start of its hour or day, in UTC.
+    """
+    moment = moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if granularity == prisma.enums.RollupGranularity.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _sql_timestamp(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+async def increment_rollups(
+    client: prisma.Prisma, feedback: prisma.models.Feedback
+) -> None:
+    """
+    Adds a newly submitted feedback entry to the hourly, daily and per-user rollups.
+
+    The upserts are single statements, so concurrent submissions into the same bucket never lose a count. Call this in the transaction that creates the feedback.
+
+    Args:
+        client (prisma.Prisma): The client or transaction to write through.
+        feedback (prisma.models.Feedback): The feedback entry that was just created.
+    """
+    identified = feedback.userId is not None
+    await client.execute_raw(
+        _INCREMENT_BUCKETS,
+        _sql_timestamp(
+            bucket_start(feedback.createdAt, prisma.enums.RollupGranularity.HOUR)
+        ),
+        _sql_timestamp(
+            bucket_start(feedback.createdAt, prisma.enums.RollupGranularity.DAY)
+        ),
+        0 if identified else 1,
+        1 if identified else 0,
+    )
+    if identified:
+        await client.execute_raw(
+            _INCREMENT_USER, feedback.userId, _sql_timestamp(feedback.createdAt)
+        )
+
+
+async def rebuild_rollups() -> None:
+    """
+    Recomputes every rollup from the raw feedback table.
+
+    This is a one-off backfill for feedback that predates the rollups, or a repair after manual edits; normal operation keeps the rollups current incrementally.
+    """
+    async with prisma.get_client().tx() as transaction:
+        for statement in _REBUILD:
+            await transaction.execute_raw(statement)
+
+
+async def main() -> None:
+    db_client = prisma.Prisma(auto_register=True)
+    await db_client.connect()
+    try:
+        await rebuild_rollups()
+    finally:
+        await db_client.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
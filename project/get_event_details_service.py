@@ -1,12 +1,25 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 import prisma
 import prisma.enums
 import prisma.models
+import project.errors
+import project.event_fields
 from pydantic import BaseModel
 
 
+class MediaVariant(BaseModel):
+    """
+    A resized rendition of a media item, such as a thumbnail or a video poster frame.
+    """
+
+    name: str
+    url: str
+    width: int
+    height: int
+
+
 class Media(BaseModel):
     """
     Describes the media content related to an event, including type and URL.
@@ -14,42 +27,63 @@ class Media(BaseModel):
 
     type: prisma.enums.MediaType
     url: str
+    variants: List[MediaVariant] = []
 
 
 class EventDetailsResponse(BaseModel):
     """
-    A comprehensive model that describes the detailed information of an event, including metadata and associated media.
+    A comprehensive model that describes the detailed information of an event, including metadata and associated media. Fields left out of a sparse fieldset are omitted.
     """
 
     id: str
-    title: str
-    description: str
-    date: datetime
-    location: str
-    media: List[Media]
+    title: Optional[str] = None
+    description: Optional[str] = None
+    date: Optional[datetime] = None
+    location: Optional[str] = None
+    media: Optional[List[Media]] = None
+
 
+def _media(media: prisma.models.Media, variants: bool) -> Media:
+    item = Media(type=media.type.name, url=media.url)
+    if variants:
+        item.variants = [
+            MediaVariant(
+                name=variant.name,
+                url=variant.url,
+                width=variant.width,
+                height=variant.height,
+            )
+            for variant in media.Variants
+        ]
+    return item
 
-async def get_event_details(eventId: str) -> EventDetailsResponse:
+
+async def get_event_details(
+    eventId: str, fields: Optional[str] = None, include: Optional[str] = None
+) -> EventDetailsResponse:
     """
     Endpoint for retrieving details of a specific event.
 
     Args:
         eventId (str): The unique identifier of the event whose details are to be retrieved.
+        fields (Optional[str]): Comma-separated event fields to return, all of them by default.
+        include (Optional[str]): Comma-separated relations to load, `media` or `media.variants`.
 
     Returns:
         EventDetailsResponse: A comprehensive model that describes the detailed information of an event, including metadata and associated media.
+
+    Raises:
+        NotFoundError: If no event with the given `eventId` exists.
+        DomainError: If an unknown field or relation is requested.
     """
-    event = await prisma.models.Event.prisma().find_unique(
-        where={"id": eventId}, include={"Media": True}
-    )
-    if not event:
-        raise ValueError(f"Event with id {eventId} not found.")
-    media_list = [Media(type=media.type.name, url=media.url) for media in event.Media]
-    return EventDetailsResponse(
-        id=event.id,
-        title=event.title,
-        description=event.description,
-        date=event.date,
-        location=event.location,
-        media=media_list,
-    )
+    selection = project.event_fields.EventFieldSelection.parse(fields, include)
+    events = await project.event_fields.select_events(selection, eventId)
+    if not events:
+        raise project.errors.NotFoundError(f"Event with id {eventId} not found.")
+    response = EventDetailsResponse(**events[0])
+    if selection.media:
+        media_by_event = await project.event_fields.load_media(selection, [eventId])
+        response.media = [
+            _media(media, selection.variants) for media in media_by_event[eventId]
+        ]
+    return response
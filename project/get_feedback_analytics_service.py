@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.admin
+import project.feedback_rollups
+from pydantic import BaseModel
+
+MAX_TOP_USERS = 100
+
+DEFAULT_WINDOWS = {
+    prisma.enums.RollupGranularity.HOUR: timedelta(hours=48),
+    prisma.enums.RollupGranularity.DAY: timedelta(days=30),
+}
+
+
+class FeedbackVolume(BaseModel):
+    """
+    Feedback volume within a single hour or day, split into anonymous and identified submissions.
+    """
+
+    bucket: datetime
+    anonymous: int
+    identified: int
+    total: int
+
+
+class FeedbackUserCount(BaseModel):
+    """
+    The number of feedback entries submitted by a single user.
+    """
+
+    userId: str
+    count: int
+    lastFeedbackAt: datetime
+
+
+class FeedbackAnalyticsResponse(BaseModel):
+    """
+    Feedback volume over the requested window together with the most active users, read from the precomputed rollups.
+    """
+
+    granularity: prisma.enums.RollupGranularity
+    volume: List[FeedbackVolume]
+    anonymousTotal: int
+    identifiedTotal: int
+    topUsers: List[FeedbackUserCount]
+
+
+async def get_feedback_analytics(
+    adminToken: Optional[str],
+    granularity: prisma.enums.RollupGranularity,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    topUsers: int,
+) -> FeedbackAnalyticsResponse:
+    """
+    Endpoint for reporting feedback volume and per-user counts. Admin only, as it names the most active users.
+
+    Only rollup rows are read, so the cost depends on the size of the window and not on the number of feedback entries.
+
+    Args:
+        adminToken (Optional[str]): The `X-Admin-Token` header of the request.
+        granularity (prisma.enums.RollupGranularity): Whether to report volume per hour or per day.
+        start (Optional[datetime]): Start of the window. Defaults to 48 hours or 30 days before `end`, depending on the granularity. Timestamps without a zone are taken as UTC.
+        end (Optional[datetime]): End of the window. Defaults to now.
+        topUsers (int): How many of the most active users to include, capped at `MAX_TOP_USERS`.
+
+    Returns:
+        FeedbackAnalyticsResponse: Feedback volume over the requested window together with the most active users, read from the precomputed rollups.
+
+    Raises:
+        ForbiddenError: If the admin token is missing or wrong.
+    """
+    project.admin.require_admin(adminToken)
+    if start and start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end and end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    topUsers = max(1, min(topUsers, MAX_TOP_USERS))
+    end = end or datetime.now(timezone.utc)
+    start = start or end - DEFAULT_WINDOWS[granularity]
+    rollups = await prisma.models.FeedbackRollup.prisma().find_many(
+        where={
+            "granularity": granularity,
+            "bucket": {
+                "gte": project.feedback_rollups.bucket_start(start, granularity),
+                "lte": end,
+            },
+        },
+        order={"bucket": "asc"},
+    )
+    users = await prisma.models.FeedbackUserRollup.prisma().find_many(
+        order={"count": "desc"}, take=topUsers
+    )
+    volume = [
+        FeedbackVolume(
+            bucket=rollup.bucket,
+            anonymous=rollup.anonymousCount,
+            identified=rollup.identifiedCount,
+            total=rollup.anonymousCount + rollup.identifiedCount,
+        )
+        for rollup in rollups
+    ]
+    return FeedbackAnalyticsResponse(
+        granularity=granularity,
+        volume=volume,
+        anonymousTotal=sum(item.anonymous for item in volume),
+        identifiedTotal=sum(item.identified for item in volume),
+        topUsers=[
+            FeedbackUserCount(
+                userId=user.userId, count=user.count, lastFeedbackAt=user.lastFeedbackAt
+            )
+            for user in users
+        ],
+    )
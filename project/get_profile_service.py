@@ -0,0 +1,25 @@
+from typing import Optional
+
+import project.profiling
+from fastapi.responses import FileResponse
+
+
+async def get_profile(adminToken: Optional[str], name: str) -> FileResponse:
+    """
+    Endpoint for downloading a recorded request profile. Admin only.
+
+    Args:
+        adminToken (Optional[str]): The `X-Admin-Token` header of the request.
+        name (str): The file name, as listed by the profile listing endpoint.
+
+    Returns:
+        FileResponse: The speedscope JSON or collapsed-stack file.
+
+    Raises:
+        ForbiddenError: If the admin token is missing or wrong.
+        NotFoundError: If there is no such profile.
+    """
+    project.admin.require_admin(adminToken)
+    path = project.profiling.profile_path(name)
+    media_type = "application/json" if name.endswith(".json") else "text/plain"
+    return FileResponse(path, media_type=media_type, filename=name)
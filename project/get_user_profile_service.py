@@ -3,6 +3,7 @@ from enum import Enum
 import prisma
 import prisma.enums
 import prisma.models
+import project.errors
 from pydantic import BaseModel
 
 
@@ -18,6 +19,8 @@ class UserProfileResponse(BaseModel):
     role: prisma.enums.Role
     createdAt: str
     updatedAt: str
+    eventCount: int = 0
+    feedbackCount: int = 0
 
 
 class Role(Enum):
@@ -35,12 +38,15 @@ async def get_user_profile(userId: str) -> UserProfileResponse:
 
     Returns:
         UserProfileResponse: Model representing detailed user profile information, containing both personal data and account specifics.
+
+    Raises:
+        NotFoundError: If the user or their profile does not exist.
     """
     user = await prisma.models.User.prisma().find_unique(
-        where={"id": userId}, include={"Profile": True}
+        where={"id": userId}, include={"Profile": True, "FeedbackRollup": True}
     )
     if not user or not user.Profile:
-        raise Exception("User or User Profile not found")
+        raise project.errors.NotFoundError("User or User Profile not found")
     user_profile_response = UserProfileResponse(
         userId=user.id,
         firstName=user.Profile.firstName,
@@ -49,5 +55,8 @@ async def get_user_profile(userId: str) -> UserProfileResponse:
         role=user.role,
         createdAt=user.createdAt.isoformat(),
         updatedAt=user.updatedAt.isoformat(),
+        # Both counts are maintained on write, so the profile never counts rows.
+        eventCount=user.eventCount,
+        feedbackCount=user.FeedbackRollup.count if user.FeedbackRollup else 0,
     )
     return user_profile_response
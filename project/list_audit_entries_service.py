@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import List, Optional
+
+import prisma
+import prisma.models
+import project.admin
+import project.audit_log
+from pydantic import BaseModel
+
+
+class AuditEntryDetails(BaseModel):
+    """
+    A single audited write: who did what to which record, and when.
+    """
+
+    action: str
+    entity: str
+    entityId: str
+    actor: Optional[str] = None
+    clientIp: Optional[str] = None
+    occurredAt: datetime
+
+
+class AuditEntriesResponse(BaseModel):
+    """
+    The most recent audit entries, newest first, along with the state of this worker's audit buffer.
+    """
+
+    entries: List[AuditEntryDetails]
+    buffered: int
+    dropped: int
+
+
+async def list_audit_entries(
+    adminToken: Optional[str],
+    limit: int,
+    entity: Optional[str],
+    entityId: Optional[str],
+) -> AuditEntriesResponse:
+    """
+    Endpoint for listing recent audit entries. Admin only, as entries carry actor ids and client addresses.
+
+    With the Postgres sink the entries of all workers are read from the database; entries still waiting in a buffer appear after the next flush. With the file sink only the entries recently recorded by the worker serving the request are available.
+
+    Args:
+        adminToken (Optional[str]): The `X-Admin-Token` header of the request.
+        limit (int): The maximum number of entries to return.
+        entity (Optional[str]): Only return entries for this kind of record, `event` or `media`.
+        entityId (Optional[str]): Only return entries for this record.
+
+    Returns:
+        AuditEntriesResponse: The most recent audit entries, newest first, along with the state of this worker's audit buffer.
+
+    Raises:
+        ForbiddenError: If the admin token is missing or wrong.
+    """
+    project.admin.require_admin(adminToken)
+    audit_log = project.audit_log.audit_log
+    if audit_log.sink == "postgres":
+        where = {}
+        if entity:
+            where["entity"] = entity
+        if entityId:
+            where["entityId"] = entityId
+        rows = await prisma.models.AuditEntry.prisma().find_many(
+            where=where, order={"occurredAt": "desc"}, take=limit
+        )
+        entries = [AuditEntryDetails(**row.dict()) for row in rows]
+    else:
+        entries = [
+            AuditEntryDetails(**entry.dict())
+            for entry in audit_log.recent(limit, entity, entityId)
+        ]
+    return AuditEntriesResponse(
+        entries=entries, buffered=audit_log.buffered, dropped=audit_log.dropped
+    )
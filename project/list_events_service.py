@@ -1,11 +1,23 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 import prisma
 import prisma.models
+import project.event_fields
 from pydantic import BaseModel
 
 
+class MediaVariantDetails(BaseModel):
+    """
+    A resized rendition of a media item, letting list views fetch a thumbnail instead of the original.
+    """
+
+    name: str
+    url: str
+    width: int
+    height: int
+
+
 class MediaDetails(BaseModel):
     """
     Details about the multimedia content associated with an event.
@@ -13,19 +25,20 @@ class MediaDetails(BaseModel):
 
     url: str
     type: str
+    variants: List[MediaVariantDetails] = []
 
 
 class EventDetails(BaseModel):
     """
-    Details about an individual event, optimized for listing purposes.
+    Details about an individual event, optimized for listing purposes. Fields left out of a sparse fieldset are omitted.
     """
 
     id: str
-    title: str
-    description: str
-    date: datetime
-    location: str
-    media: List[MediaDetails]
+    title: Optional[str] = None
+    description: Optional[str] = None
+    date: Optional[datetime] = None
+    location: Optional[str] = None
+    media: Optional[List[MediaDetails]] = None
 
 
 class ListEventsResponse(BaseModel):
@@ -36,27 +49,50 @@ class ListEventsResponse(BaseModel):
     events: List[EventDetails]
 
 
-async def list_events() -> ListEventsResponse:
+def _media_details(media: prisma.models.Media, variants: bool) -> MediaDetails:
+    details = MediaDetails(url=media.url, type=media.type.name)
+    if variants:
+        details.variants = [
+            MediaVariantDetails(
+                name=variant.name,
+                url=variant.url,
+                width=variant.width,
+                height=variant.height,
+            )
+            for variant in media.Variants
+        ]
+    return details
+
+
+async def list_events(
+    fields: Optional[str] = None, include: Optional[str] = None
+) -> ListEventsResponse:
     """
     Endpoint for listing all events.
 
+    Args:
+        fields (Optional[str]): Comma-separated event fields to return, all of them by default.
+        include (Optional[str]): Comma-separated relations to load, `media` or `media.variants`.
+
     Returns:
     ListEventsResponse: The response model providing a list of events, including their basic information and associated multimedia content. The aim is to provide enough detail to allow users to identify events of interest without overwhelming the response body with too much intricate detail.
+
+    Raises:
+        DomainError: If an unknown field or relation is requested.
     """
-    events = await prisma.models.Event.prisma().find_many(include={"Media": True})
+    selection = project.event_fields.EventFieldSelection.parse(fields, include)
+    events = await project.event_fields.select_events(selection)
+    media_by_event = await project.event_fields.load_media(
+        selection, [event["id"] for event in events]
+    )
     event_details_list = []
     for event in events:
-        media_details = [
-            MediaDetails(url=media.url, type=media.type.name) for media in event.Media
-        ]
-        event_details = EventDetails(
-            id=event.id,
-            title=event.title,
-            description=event.description,
-            date=event.date,
-            location=event.location,
-            media=media_details,
-        )
+        event_details = EventDetails(**event)
+        if selection.media:
+            event_details.media = [
+                _media_details(media, selection.variants)
+                for media in media_by_event[event["id"]]
+            ]
         event_details_list.append(event_details)
     list_events_response = ListEventsResponse(events=event_details_list)
     return list_events_response
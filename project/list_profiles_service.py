@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import project.admin
+import project.profiling
+from pydantic import BaseModel
+
+
+class ProfileFile(BaseModel):
+    """
+    A profile written by the profiling middleware.
+    """
+
+    name: str
+    size: int
+    modified: datetime
+
+
+class ListProfilesResponse(BaseModel):
+    """
+    The profiles available for download, newest first.
+    """
+
+    profiles: List[ProfileFile]
+
+
+async def list_profiles(adminToken: Optional[str]) -> ListProfilesResponse:
+    """
+    Endpoint for listing recorded request profiles. Admin only.
+
+    Args:
+        adminToken (Optional[str]): The `X-Admin-Token` header of the request.
+
+    Returns:
+        ListProfilesResponse: The profiles available for download, newest first.
+
+    Raises:
+        ForbiddenError: If the admin token is missing or wrong.
+    """
+    project.admin.require_admin(adminToken)
+    return ListProfilesResponse(
+        profiles=[
+            ProfileFile(
+                name=entry["name"],
+                size=entry["size"],
+                modified=datetime.fromtimestamp(entry["modified"], timezone.utc),
+            )
+            for entry in project.profiling.list_profile_files()
+        ]
+    )
@@ -0,0 +1,95 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import prisma
+import prisma.models
+import project.errors
+from pydantic import BaseModel
+
+MAX_PAGE_SIZE = 100
+
+
+class UserEventSummary(BaseModel):
+    """
+    An event created by the user, with the fields a "my events" list shows.
+    """
+
+    id: str
+    title: str
+    date: datetime
+    location: str
+    createdAt: datetime
+
+
+class UserEventsResponse(BaseModel):
+    """
+    One page of a user's events, newest first. Pass `nextCursor` back as `cursor` to fetch the following page; it is absent on the last page.
+    """
+
+    events: List[UserEventSummary]
+    nextCursor: Optional[str] = None
+
+
+def _encode_cursor(event: prisma.models.Event) -> str:
+    position = f"{event.createdAt.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        createdAt, id = (
+            base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        )
+        return {"createdAt": datetime.fromisoformat(createdAt), "id": id}
+    except (binascii.Error, UnicodeError, ValueError):
+        raise project.errors.DomainError("Invalid cursor.")
+
+
+async def list_user_events(
+    userId: str, limit: int = 20, cursor: Optional[str] = None
+) -> UserEventsResponse:
+    """
+    Lists the events a user created, newest first, using keyset pagination.
+
+    Pages are read straight off the `(createdBy, createdAt, id)` index: the cursor holds the position of the last event returned, so every page costs the same however deep into the list it is.
+
+    Args:
+        userId (str): Identifier of the user whose events are listed.
+        limit (int): Maximum number of events per page, capped at `MAX_PAGE_SIZE`.
+        cursor (Optional[str]): The `nextCursor` of the previous page.
+
+    Returns:
+        UserEventsResponse: One page of the user's events and the cursor for the next.
+
+    Raises:
+        DomainError: If the cursor is malformed.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    where: Dict[str, Any] = {"createdBy": userId}
+    if cursor is not None:
+        after = _decode_cursor(cursor)
+        where["OR"] = [
+            {"createdAt": {"lt": after["createdAt"]}},
+            {"createdAt": after["createdAt"], "id": {"lt": after["id"]}},
+        ]
+    events = await prisma.models.Event.prisma().find_many(
+        where=where,
+        order=[{"createdAt": "desc"}, {"id": "desc"}],
+        take=limit + 1,
+    )
+    page = events[:limit]
+    return UserEventsResponse(
+        events=[
+            UserEventSummary(
+                id=event.id,
+                title=event.title,
+                date=event.date,
+                location=event.location,
+                createdAt=event.createdAt,
+            )
+            for event in page
+        ],
+        nextCursor=_encode_cursor(page[-1]) if len(events) > limit else None,
+    )
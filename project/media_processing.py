@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.change_feed
+import project.cpu_quota
+import project.media_storage
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+IMAGE_VARIANTS: Dict[str, int] = {"thumb": 256, "medium": 1024}
+
+# Per app worker: by default each one gets its share of the container's CPUs.
+MEDIA_WORKERS = int(
+    os.environ.get(
+        "MEDIA_WORKERS",
+        min(
+            4,
+            max(
+                project.cpu_quota.available_cpus()
+                // int(os.environ.get("WEB_CONCURRENCY", "1")),
+                1,
+            ),
+        ),
+    )
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+_pending: Set[asyncio.Task] = set()
+
+
+class RenderedVariant(BaseModel):
+    """
+    A derived asset written next to its original by a worker process.
+    """
+
+    name: str
+    key: str
+    width: int
+    height: int
+
+
+def _save_jpeg(image, target: Path) -> None:
+    # Identical uploads share a directory, so a variant is written to a
+    # temporary file and renamed into place; a concurrent upload never sees
+    # (and records) a half-written JPEG.
+    with tempfile.NamedTemporaryFile(
+        dir=target.parent, suffix=".tmp", delete=False
+    ) as handle:
+        try:
+            image.save(handle, "JPEG", quality=82, optimize=True, progressive=True)
+        except BaseException:
+            handle.close()
+            os.unlink(handle.name)
+            raise
+    os.replace(handle.name, target)
+
+
+def _render_image_variants(source: str, original_key: str) -> List[RenderedVariant]:
+    from PIL import Image, ImageOps
+
+    sizes = sorted(IMAGE_VARIANTS.items(), key=lambda item: item[1], reverse=True)
+    rendered = []
+    with Image.open(source) as image:
+        # Let the JPEG decoder downscale while decoding instead of
+        # materialising the full-resolution bitmap first.
+        image.draft("RGB", (sizes[0][1], sizes[0][1]))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for name, size in sizes:
+            key = project.media_storage.variant_key(original_key, name)
+            target = project.media_storage.path_for(key)
+            image.thumbnail((size, size), Image.LANCZOS)
+            if not target.exists():
+                _save_jpeg(image, target)
+            rendered.append(
+                RenderedVariant(
+                    name=name, key=key, width=image.width, height=image.height
+                )
+            )
+    return rendered
+
+
+def _render_video_variants(source: str, original_key: str) -> List[RenderedVariant]:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        logger.warning("ffmpeg is not installed, skipping poster frames")
+        return []
+    with tempfile.TemporaryDirectory() as workdir:
+        poster = os.path.join(workdir, "poster.jpg")
+        subprocess.run(
+            [
+                ffmpeg,
+                "-v",
+                "error",
+                "-ss",
+                "1",
+                "-i",
+                source,
+                "-frames:v",
+                "1",
+                "-y",
+                poster,
+            ],
+            check=True,
+            timeout=60,
+        )
+        return _render_image_variants(poster, original_key)
+
+
+def _render_variants(
+    source: str, original_key: str, media_type: prisma.enums.MediaType
+) -> List[RenderedVariant]:
+    if media_type == prisma.enums.MediaType.VIDEO:
+        return _render_video_variants(source, original_key)
+    return _render_image_variants(source, original_key)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=MEDIA_WORKERS)
+    return _executor
+
+
+async def generate_variants(
+    mediaId: str, storageKey: str, mediaType: prisma.enums.MediaType
+) -> None:
+    """
+    Renders resized image variants, or poster frames for videos, in the worker pool and records them against the media item.
+
+    Args:
+        mediaId (str): Identifier of the media item the variants belong to.
+        storageKey (str): Storage key of the uploaded original.
+        mediaType (prisma.enums.MediaType): The recorded type of the original.
+    """
+    loop = asyncio.get_running_loop()
+    source = str(project.media_storage.path_for(storageKey))
+    rendered = await loop.run_in_executor(
+        _get_executor(), _render_variants, source, storageKey, mediaType
+    )
+    if not rendered:
+        return
+    await prisma.models.MediaVariant.prisma().create_many(
+        data=[
+            {
+                "mediaId": mediaId,
+                "name": variant.name,
+                "storageKey": variant.key,
+                "url": project.media_storage.url_for(variant.key),
+                "width": variant.width,
+                "height": variant.height,
+            }
+            for variant in rendered
+        ],
+        skip_duplicates=True,
+    )
+    # Touch the media row so delta sync picks up the new variants.
+    media = await prisma.models.Media.prisma().update(
+        where={"id": mediaId}, data={"updatedAt": datetime.now(timezone.utc)}
+    )
+    if media is None:
+        return
+    await project.change_feed.record_change(
+        "media", "updated", mediaId, media.eventId
+    )
+
+
+async def _generate_variants_logged(
+    mediaId: str, storageKey: str, mediaType: prisma.enums.MediaType
+) -> None:
+    try:
+        await generate_variants(mediaId, storageKey, mediaType)
+    except Exception:
+        logger.exception("Failed to generate variants for media %s", mediaId)
+
+
+def schedule_variants(
+    mediaId: str, storageKey: str, mediaType: prisma.enums.MediaType
+) -> None:
+    """
+    Queues variant generation for a freshly uploaded media item without delaying the upload response.
+    """
+    if mediaType not in (prisma.enums.MediaType.IMAGE, prisma.enums.MediaType.VIDEO):
+        return
+    task = asyncio.create_task(
+        _generate_variants_logged(mediaId, storageKey, mediaType)
+    )
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def shutdown() -> None:
+    """
+    Waits for queued variant jobs to finish and stops the worker pool.
+    """
+    global _executor
+    if _pending:
+        await asyncio.gather(*_pending, return_exceptions=True)
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Optional
+
+import prisma.models
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+MEDIA_ROOT = Path(os.environ.get("MEDIA_ROOT", "media")).resolve()
+
+MEDIA_BASE_URL = os.environ.get("MEDIA_BASE_URL", "/media/file").rstrip("/")
+
+
+class StoredFile(BaseModel):
+    """
+    Location of a blob written to the local media store. The key is relative to the media root and is derived from the content digest, so identical uploads share a single directory.
+    """
+
+    key: str
+    digest: str
+    size: int
+
+
+def path_for(key: str) -> Path:
+    """
+    Resolves a storage key to an absolute path below the media root.
+
+    Args:
+        key (str): The storage key, as returned by `store_original` or built by `variant_key`.
+
+    Returns:
+        Path: The absolute location of the blob on the local filesystem.
+
+    Raises:
+        ValueError: If the key would resolve outside the media root.
+    """
+    path = (MEDIA_ROOT / key).resolve()
+    if MEDIA_ROOT not in path.parents:
+        raise ValueError(f"Invalid storage key {key!r}.")
+    return path
+
+
+def url_for(key: str) -> str:
+    """
+    Builds the public URL under which a stored blob is published.
+    """
+    return f"{MEDIA_BASE_URL}/{key}"
+
+
+def variant_key(original_key: str, name: str) -> str:
+    """
+    Builds the storage key of a derived asset, which lives in the same directory as its original.
+    """
+    return str(PurePosixPath(original_key).parent / f"{name}.jpg")
+
+
+def _write_original(content: bytes, filename: str) -> StoredFile:
+    digest = hashlib.sha256(content).hexdigest()
+    suffix = Path(filename).suffix.lower()
+    key = f"{digest[:2]}/{digest}/original{suffix}"
+    path = path_for(key)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as handle:
+            handle.write(content)
+        os.replace(handle.name, path)
+    return StoredFile(key=key, digest=digest, size=len(content))
+
+
+async def store_original(content: bytes, filename: str) -> StoredFile:
+    """
+    Writes an uploaded file to the content-addressed media store without blocking the event loop.
+
+    Args:
+        content (bytes): The raw bytes of the uploaded file.
+        filename (str): The client-supplied file name; only its extension is kept.
+
+    Returns:
+        StoredFile: Location of the blob written to the local media store.
+    """
+    return await asyncio.to_thread(_write_original, content, filename)
+
+
+def _remove_blob_directory(key: str) -> None:
+    directory = path_for(key).parent
+    if directory == MEDIA_ROOT:
+        return
+    shutil.rmtree(directory, ignore_errors=True)
+    try:
+        # Drop the digest fan-out directory once its last blob is gone.
+        directory.parent.rmdir()
+    except OSError:
+        pass
+
+
+async def remove_unreferenced(keys: Iterable[Optional[str]]) -> None:
+    """
+    Removes the stored blobs, original and variants, of deleted media items once no remaining media item references them.
+
+    Uploads are content-addressed, so several media items can share a blob; callers pass the storage keys of the rows they deleted after their transaction commits. Failures are logged rather than raised, since the rows are already gone.
+
+    Args:
+        keys (Iterable[Optional[str]]): Storage keys of the deleted media items; items without a stored upload have none.
+    """
+    for key in {key for key in keys if key}:
+        try:
+            if await prisma.models.Media.prisma().find_first(
+                where={"storageKey": key}
+            ):
+                continue
+            await asyncio.to_thread(_remove_blob_directory, key)
+        except Exception:
+            logger.exception("Failed to remove stored blob %s", key)
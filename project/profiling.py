@@ -0,0 +1,158 @@
+import asyncio
+import itertools
+import logging
+import os
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import project.admin
+import project.errors
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "profiles"))
+
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+
+PROFILE_INTERVAL_SECONDS = float(os.environ.get("PROFILE_INTERVAL_SECONDS", "0.001"))
+
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", "200"))
+
+PROFILE_HEADER = "x-profile"
+
+# Keeps names unique when one worker profiles several requests within the
+# same second; the pid separates workers.
+_profile_sequence = itertools.count(1)
+
+# Responses on these paths can stay open for hours; profiling one would keep
+# the worker from profiling anything else until it ends.
+STREAMING_PATH_PREFIXES = ("/changes/stream", "/media/file/")
+
+
+def _collapsed_stacks(frame, prefix: str, lines: List[str]) -> None:
+    stack = f"{prefix}{frame.function} ({frame.file_path_short}:{frame.line_no})"
+    self_time = frame.time - sum(child.time for child in frame.children)
+    if self_time > 0:
+        lines.append(f"{stack} {round(self_time * 1e6)}")
+    for child in frame.children:
+        _collapsed_stacks(child, f"{stack};", lines)
+
+
+def _write_profile(session, stem: str) -> None:
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    (PROFILE_DIR / f"{stem}.speedscope.json").write_text(
+        SpeedscopeRenderer().render(session)
+    )
+    lines: List[str] = []
+    root = session.root_frame()
+    if root is not None:
+        _collapsed_stacks(root, "", lines)
+    (PROFILE_DIR / f"{stem}.collapsed.txt").write_text("\n".join(lines) + "\n")
+    _prune_profiles()
+
+
+def _prune_profiles() -> None:
+    files = sorted(
+        (path for path in PROFILE_DIR.iterdir() if path.is_file()),
+        key=lambda path: path.stat().st_mtime,
+    )
+    for stale in files[: max(len(files) - PROFILE_MAX_FILES, 0)]:
+        stale.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that carry the admin `X-Profile` header, plus a `PROFILE_SAMPLE_RATE` fraction of all requests.
+
+    The profiler runs in pyinstrument's async mode, so time a handler spends awaiting the service function and its Prisma calls is attributed to the awaiting code. Each profile is written to `PROFILE_DIR` as speedscope JSON and as collapsed stacks (microseconds per stack), and its name is returned in the `X-Profile-Id` response header. Only the newest `PROFILE_MAX_FILES` files are kept.
+
+    Only one request per worker is profiled at a time, so long-lived streaming responses (`STREAMING_PATH_PREFIXES`, or any request accepting `text/event-stream`) are never profiled. Nothing happens when pyinstrument is not installed.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.active = False
+        try:
+            import pyinstrument  # noqa: F401
+
+            self.available = True
+        except ImportError:
+            self.available = False
+
+    def _wanted(self, scope: Scope) -> bool:
+        if not self.available or self.active or scope["type"] != "http":
+            return False
+        headers = Headers(scope=scope)
+        if scope["path"].startswith(STREAMING_PATH_PREFIXES) or (
+            "text/event-stream" in headers.get("accept", "")
+        ):
+            return False
+        if project.admin.is_admin(headers.get(PROFILE_HEADER)):
+            return True
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        from pyinstrument import Profiler
+
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        stem = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-"
+            f"{next(_profile_sequence)}-{scope['method']}-{slug}"
+        )
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("x-profile-id", stem)
+            await send(message)
+
+        self.active = True
+        profiler = Profiler(interval=PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            session = profiler.stop()
+            self.active = False
+            try:
+                await asyncio.to_thread(_write_profile, session, stem)
+            except Exception:
+                logger.exception("Failed to write profile %s", stem)
+
+
+def list_profile_files() -> List[Dict[str, object]]:
+    """
+    Lists the profile files written so far, newest first.
+    """
+    if not PROFILE_DIR.exists():
+        return []
+    files = sorted(
+        PROFILE_DIR.iterdir(), key=lambda path: path.stat().st_mtime, reverse=True
+    )
+    return [
+        {"name": path.name, "size": path.stat().st_size, "modified": path.stat().st_mtime}
+        for path in files
+        if path.is_file()
+    ]
+
+
+def profile_path(name: str) -> Path:
+    """
+    Resolves a profile file name to its path in `PROFILE_DIR`.
+
+    Raises:
+        NotFoundError: If there is no such profile.
+    """
+    path = PROFILE_DIR / name
+    if Path(name).name != name or not path.is_file():
+        raise project.errors.NotFoundError(f"Profile {name} not found.")
+    return path
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Optional, Set
+
+import prisma
+import prisma.models
+import project.admin
+import project.bulk_delete
+import project.errors
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+PURGE_PAUSE_SECONDS = float(os.environ.get("PURGE_PAUSE_SECONDS", "0.5"))
+
+_running: Set[asyncio.Task] = set()
+
+
+class PurgeJobResponse(BaseModel):
+    """
+    The state of a background purge and the counts removed so far.
+    """
+
+    jobId: str
+    status: str
+    eventsDeleted: int
+    mediaDeleted: int
+    error: Optional[str] = None
+    createdAt: datetime
+    updatedAt: datetime
+
+
+def _to_response(job: prisma.models.PurgeJob) -> PurgeJobResponse:
+    return PurgeJobResponse(
+        jobId=job.id,
+        status=job.status,
+        eventsDeleted=job.eventsDeleted,
+        mediaDeleted=job.mediaDeleted,
+        error=job.error,
+        createdAt=job.createdAt,
+        updatedAt=job.updatedAt,
+    )
+
+
+async def _run_purge(
+    jobId: str, selection: project.bulk_delete.EventSelection
+) -> None:
+    async def report(totals: project.bulk_delete.DeletedCounts) -> None:
+        await prisma.models.PurgeJob.prisma().update(
+            where={"id": jobId},
+            data={"eventsDeleted": totals.events, "mediaDeleted": totals.media},
+        )
+
+    try:
+        await project.bulk_delete.delete_events(
+            selection, pause=PURGE_PAUSE_SECONDS, on_batch=report
+        )
+        await prisma.models.PurgeJob.prisma().update(
+            where={"id": jobId}, data={"status": "completed"}
+        )
+    except asyncio.CancelledError:
+        await prisma.models.PurgeJob.prisma().update(
+            where={"id": jobId}, data={"status": "interrupted"}
+        )
+        raise
+    except Exception as e:
+        logger.exception("Purge %s failed", jobId)
+        await prisma.models.PurgeJob.prisma().update(
+            where={"id": jobId}, data={"status": "failed", "error": str(e)}
+        )
+
+
+async def start_purge(
+    adminToken: Optional[str], selection: project.bulk_delete.EventSelection
+) -> PurgeJobResponse:
+    """
+    Endpoint for starting a throttled background purge of events. Admin only.
+
+    Matching events are deleted in small batches with a pause between them, so the purge never locks the tables for long. Progress is stored in the database and can be polled from any worker.
+
+    Args:
+        adminToken (Optional[str]): The `X-Admin-Token` header of the request.
+        selection (project.bulk_delete.EventSelection): The events to purge, by ids, `olderThan` date and/or `createdBy` user.
+
+    Returns:
+        PurgeJobResponse: The state of the newly started purge.
+
+    Raises:
+        ForbiddenError: If the admin token is missing or wrong.
+    """
+    project.admin.require_admin(adminToken)
+    selection.where()
+    job = await prisma.models.PurgeJob.prisma().create(
+        data={"status": "running", "selection": selection.json()}
+    )
+    task = asyncio.create_task(_run_purge(job.id, selection))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return _to_response(job)
+
+
+async def get_purge_status(adminToken: Optional[str], jobId: str) -> PurgeJobResponse:
+    """
+    Endpoint for checking the progress of a background purge. Admin only.
+
+    Args:
+        adminToken (Optional[str]): The `X-Admin-Token` header of the request.
+        jobId (str): Identifier of the purge, as returned when it was started.
+
+    Returns:
+        PurgeJobResponse: The state of the purge and the counts removed so far.
+
+    Raises:
+        ForbiddenError: If the admin token is missing or wrong.
+        NotFoundError: If no purge with the given `jobId` exists.
+    """
+    project.admin.require_admin(adminToken)
+    job = await prisma.models.PurgeJob.prisma().find_unique(where={"id": jobId})
+    if not job:
+        raise project.errors.NotFoundError(f"Purge with id {jobId} not found.")
+    return _to_response(job)
+
+
+async def shutdown() -> None:
+    """
+    Interrupts purges still running in this worker; they can be restarted with the same selection.
+    """
+    for task in list(_running):
+        task.cancel()
+    if _running:
+        await asyncio.gather(*_running, return_exceptions=True)
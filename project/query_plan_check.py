@@ -0,0 +1,276 @@
+"""
+Checks that the SQL issued by each service is covered by indexes.
+
+Run with `python -m project.query_plan_check` against a seeded local database, e.g. after
+`python -m project.synthetic_data --events 100000 --reset`. The database needs auto_explain
+preloaded and the logging collector writing a csvlog, and the check must connect as a superuser
+to set auto_explain options and read the server log. The bundled docker-compose setup does all of
+this.
+
+The scenarios call the services for real, so the check writes to the seeded database: for
+example `submit_feedback` inserts a feedback row, `update_event` rewrites an event and
+`delete_media` deletes a media item. Never point it at a database whose data matters.
+
+The tables are analyzed first so that row counts and plans reflect the seeded data. For the
+duration of the run auto_explain is switched on for new sessions of the database, logging every
+statement under `EXPLAIN (ANALYZE, BUFFERS)` as JSON. Each scenario runs one service call and
+collects the plans its statements were actually executed with, real parameter values included,
+from the server log, whether Prisma generated the SQL or it is raw. A sequential scan on a table
+with at least `--min-rows` rows is flagged unless the scenario is listed in `ALLOWED_SEQ_SCANS`,
+and the exit status is non-zero when anything is flagged.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Set, Tuple
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.admin
+import project.database_url
+import project.delete_media_service
+import project.get_event_details_service
+import project.get_feedback_analytics_service
+import project.get_user_profile_service
+import project.list_events_service
+import project.list_user_events_service
+import project.submit_feedback_service
+import project.sync_changes_service
+import project.update_event_service
+
+# Tables a scenario legitimately reads in full.
+ALLOWED_SEQ_SCANS: Dict[str, Set[str]] = {
+    "list_events": {"Event", "Media", "MediaVariant"},
+    "list_events_sparse": {"Event"},
+}
+
+# Set on the database while the check runs, so they apply to the sessions
+# the Prisma engine opens for the scenarios.
+_AUTO_EXPLAIN = {
+    "auto_explain.log_min_duration": "0",
+    "auto_explain.log_analyze": "on",
+    "auto_explain.log_buffers": "on",
+    "auto_explain.log_format": "json",
+}
+
+# Column positions in a csvlog record.
+_CSV_DATABASE = 2
+_CSV_PROCESS_ID = 3
+_CSV_MESSAGE = 13
+
+_LOG_WAIT_SECONDS = 10
+
+_TABLES = """
+SELECT c.relname, c.reltuples FROM pg_class AS c
+JOIN pg_namespace AS n ON n.oid = c.relnamespace
+WHERE n.nspname = 'public' AND c.relkind = 'r'
+"""
+
+
+async def _scenarios() -> Dict[str, Callable[[], Awaitable[Any]]]:
+    event = await prisma.models.Event.prisma().find_first(include={"Media": True})
+    profile = await prisma.models.Profile.prisma().find_first()
+    if event is None or profile is None:
+        raise SystemExit("Seed the database first, e.g. with project.synthetic_data.")
+    since = datetime.now(timezone.utc) - timedelta(hours=1)
+    media = event.Media or []
+    scenarios: Dict[str, Callable[[], Awaitable[Any]]] = {
+        "list_events": lambda: project.list_events_service.list_events(),
+        "get_event_details": lambda: project.get_event_details_service.get_event_details(
+            event.id
+        ),
+        # Sparse fieldsets read events with raw SQL rather than through Prisma.
+        "list_events_sparse": lambda: project.list_events_service.list_events(
+            "id,title,date"
+        ),
+        "get_event_details_sparse": lambda: project.get_event_details_service.get_event_details(
+            event.id, "id,title", "media"
+        ),
+        "get_user_profile": lambda: project.get_user_profile_service.get_user_profile(
+            profile.userId
+        ),
+        "list_user_events": lambda: project.list_user_events_service.list_user_events(
+            event.createdBy
+        ),
+        "submit_feedback": lambda: project.submit_feedback_service.submit_feedback(
+            profile.userId, "Query plan check"
+        ),
+        "sync_changes": lambda: project.sync_changes_service.sync_changes(since),
+        "update_event": lambda: project.update_event_service.update_event(
+            event.id, event.title, event.description, event.date, event.location, []
+        ),
+    }
+    if project.admin.ADMIN_TOKEN:
+        scenarios[
+            "get_feedback_analytics"
+        ] = lambda: project.get_feedback_analytics_service.get_feedback_analytics(
+            project.admin.ADMIN_TOKEN, prisma.enums.RollupGranularity.DAY, None, None, 10
+        )
+    if media:
+        scenarios["delete_media"] = lambda: project.delete_media_service.delete_media(
+            media[0].id
+        )
+    return scenarios
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+class _ServerLog:
+    """
+    Follows the server's csvlog from the current end, across rotations.
+    """
+
+    def __init__(self, connection: Any) -> None:
+        self.connection = connection
+        self.path = ""
+        self.offset = 0
+
+    async def seek_end(self) -> None:
+        self.path = await self._current_path()
+        self.offset = await self._size(self.path)
+
+    async def read(self) -> str:
+        text = await self._read_from(self.path)
+        current = await self._current_path()
+        if current != self.path:
+            self.path, self.offset = current, 0
+            text += await self._read_from(current)
+        return text
+
+    async def _current_path(self) -> str:
+        path = await self.connection.fetchval("SELECT pg_current_logfile('csvlog')")
+        if path is None:
+            raise SystemExit(
+                "Start Postgres with logging_collector=on and log_destination=csvlog."
+            )
+        return path
+
+    async def _size(self, path: str) -> int:
+        return await self.connection.fetchval("SELECT size FROM pg_stat_file($1)", path)
+
+    async def _read_from(self, path: str) -> str:
+        size = await self._size(path)
+        if size <= self.offset:
+            return ""
+        text = await self.connection.fetchval(
+            "SELECT pg_read_file($1, $2, $3)", path, self.offset, size - self.offset
+        )
+        self.offset = size
+        return text
+
+
+async def _logged_plans(
+    connection: Any, log: _ServerLog, database: str, marker: str
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Collects the plans auto_explain logged for other sessions of the database up to `marker`, which this connection logs once the scenario has returned.
+    """
+    await connection.execute(f"DO $$BEGIN RAISE LOG '{marker}'; END$$")
+    own_pid = str(connection.get_server_pid())
+    text = ""
+    for _ in range(int(_LOG_WAIT_SECONDS / 0.1)):
+        text += await log.read()
+        records = list(csv.reader(io.StringIO(text)))
+        if any(record[_CSV_MESSAGE] == marker for record in records):
+            break
+        await asyncio.sleep(0.1)
+    else:
+        raise SystemExit(f"{marker!r} did not reach the server log.")
+    plans = []
+    for record in records:
+        if record[_CSV_MESSAGE] == marker:
+            break
+        if record[_CSV_DATABASE] != database or record[_CSV_PROCESS_ID] == own_pid:
+            continue
+        _, found, explained = record[_CSV_MESSAGE].partition(" plan:\n")
+        if found:
+            explain = json.loads(explained)
+            plans.append((explain["Query Text"], explain["Plan"]))
+    return plans
+
+
+async def check(min_rows: int) -> List[str]:
+    """
+    Runs every scenario and reports the sequential scans on large tables that it caused.
+
+    Returns:
+        List[str]: A description of every flagged sequential scan.
+    """
+    import asyncpg
+
+    connection = await asyncpg.connect(project.database_url.asyncpg_dsn())
+    database = await connection.fetchval("SELECT current_database()")
+    try:
+        # Until a table is analyzed reltuples is -1 (0 before Postgres 14), and
+        # the planner has no statistics for it either.
+        await connection.execute("ANALYZE")
+        rows = {
+            record["relname"]: record["reltuples"]
+            for record in await connection.fetch(_TABLES)
+        }
+        table_names = [f'"{table}"' for table in rows]
+        log = _ServerLog(connection)
+        await log.seek_end()
+        for setting, value in _AUTO_EXPLAIN.items():
+            await connection.execute(
+                f'ALTER DATABASE "{database}" SET {setting} = {value}'
+            )
+        db_client = prisma.Prisma(auto_register=True)
+        await db_client.connect()
+        try:
+            flagged = []
+            for name, call in (await _scenarios()).items():
+                await log.seek_end()
+                await call()
+                plans = [
+                    (query, plan)
+                    for query, plan in await _logged_plans(
+                        connection, log, database, f"query_plan_check: {name} done"
+                    )
+                    if any(table in query for table in table_names)
+                ]
+                print(f"{name}: {len(plans)} statements")
+                for query, plan in plans:
+                    for node in _plan_nodes(plan):
+                        table = node.get("Relation Name")
+                        if (
+                            node["Node Type"] != "Seq Scan"
+                            or rows.get(table, 0) < min_rows
+                        ):
+                            continue
+                        if table in ALLOWED_SEQ_SCANS.get(name, set()):
+                            continue
+                        flagged.append(
+                            f"{name}: Seq Scan on {table} (~{int(rows[table])} rows)\n    {query}"
+                        )
+            return flagged
+        finally:
+            await db_client.disconnect()
+    finally:
+        for setting in _AUTO_EXPLAIN:
+            await connection.execute(f'ALTER DATABASE "{database}" RESET {setting}')
+        await connection.close()
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min-rows", type=int, default=10000)
+    args = parser.parse_args()
+    flagged = await check(args.min_rows)
+    for finding in flagged:
+        print(finding, file=sys.stderr)
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
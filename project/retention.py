@@ -0,0 +1,86 @@
+"""
+Prunes the change log and tombstones once they fall out of their retention windows.
+
+Each worker runs `start()` from the app's lifespan; the deletes are idempotent, so workers
+pruning concurrently only repeat each other's work. Run `python -m project.retention` to prune
+once, e.g. from a scheduled job.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+import prisma
+import project.change_feed
+import project.tombstones
+
+logger = logging.getLogger(__name__)
+
+RETENTION_INTERVAL_SECONDS = float(os.environ.get("RETENTION_INTERVAL_SECONDS", "3600"))
+
+_task: Optional[asyncio.Task] = None
+
+
+async def prune() -> None:
+    """
+    Deletes changes older than `CHANGE_RETENTION` and tombstones older than `TOMBSTONE_RETENTION`.
+    """
+    now = datetime.now(timezone.utc)
+    changes = await project.change_feed.prune_changes(
+        now - project.change_feed.CHANGE_RETENTION
+    )
+    tombstones = await project.tombstones.prune_tombstones(
+        now - project.tombstones.TOMBSTONE_RETENTION
+    )
+    if changes or tombstones:
+        logger.info("Pruned %d changes and %d tombstones", changes, tombstones)
+
+
+async def _run() -> None:
+    while True:
+        try:
+            await prune()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Retention pruning failed")
+        await asyncio.sleep(RETENTION_INTERVAL_SECONDS)
+
+
+def start() -> None:
+    """
+    Starts pruning in the background every `RETENTION_INTERVAL_SECONDS`.
+    """
+    global _task
+    _task = asyncio.create_task(_run())
+
+
+async def stop() -> None:
+    """
+    Stops the background pruning started by `start`.
+    """
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
+
+
+async def main() -> None:
+    db_client = prisma.Prisma(auto_register=True)
+    await db_client.connect()
+    try:
+        await prune()
+    finally:
+        await db_client.disconnect()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
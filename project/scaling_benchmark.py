@@ -0,0 +1,156 @@
+"""
+Runs the read and write services against synthetic data sets of increasing size.
+
+Run with `python -m project.scaling_benchmark --reset --sizes 10000 100000 1000000` against a
+disposable database: for each size every table behind `DATABASE_URL` is emptied and reloaded
+with `project.synthetic_data`, so `--reset` must be passed to confirm that. Every service is then
+called repeatedly with randomly picked inputs. The p95 latency and the peak
+Python memory allocated during a call are checked against `BUDGETS`, and the exit status is
+non-zero when any budget is exceeded, so regressions that only appear at production volume fail
+the release check. `list_events` returns the whole catalogue without pagination, so it is only
+measured up to its budget's `max_events`.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import prisma
+import project.get_event_details_service
+import project.get_user_profile_service
+import project.list_events_service
+import project.list_user_events_service
+import project.submit_feedback_service
+import project.synthetic_data
+
+
+class Budget(NamedTuple):
+    p95_ms: float
+    peak_mb: float
+    # Larger data sets are skipped for services whose cost grows with the
+    # catalogue by design.
+    max_events: Optional[int] = None
+
+
+BUDGETS: Dict[str, Budget] = {
+    "list_events": Budget(p95_ms=1000, peak_mb=256, max_events=100_000),
+    "list_events_sparse": Budget(p95_ms=500, peak_mb=64, max_events=100_000),
+    "get_event_details": Budget(p95_ms=25, peak_mb=4),
+    "get_user_profile": Budget(p95_ms=25, peak_mb=4),
+    "list_user_events": Budget(p95_ms=25, peak_mb=4),
+    "submit_feedback": Budget(p95_ms=50, peak_mb=4),
+}
+
+
+def _calls(
+    ids: Dict[str, List[str]], rng: random.Random
+) -> Dict[str, Callable[[], Awaitable[object]]]:
+    return {
+        "list_events": lambda: project.list_events_service.list_events(),
+        "list_events_sparse": lambda: project.list_events_service.list_events(
+            "id,title,date"
+        ),
+        "get_event_details": lambda: project.get_event_details_service.get_event_details(
+            rng.choice(ids["events"])
+        ),
+        "get_user_profile": lambda: project.get_user_profile_service.get_user_profile(
+            rng.choice(ids["profiled"])
+        ),
+        # The first user is the most prolific creator in the synthetic data.
+        "list_user_events": lambda: project.list_user_events_service.list_user_events(
+            ids["users"][0]
+        ),
+        "submit_feedback": lambda: project.submit_feedback_service.submit_feedback(
+            rng.choice(ids["users"]), "Scaling benchmark feedback"
+        ),
+    }
+
+
+async def _measure(
+    call: Callable[[], Awaitable[object]], runs: int
+) -> Tuple[float, float]:
+    latencies = []
+    peak = 0
+    for _ in range(runs):
+        tracemalloc.start()
+        started = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - started) * 1000)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    p95 = statistics.quantiles(latencies, n=20)[-1] if runs > 1 else latencies[0]
+    return p95, peak / (1024 * 1024)
+
+
+async def run(sizes: List[int], runs: int, seed: int) -> List[str]:
+    """
+    Loads each data set size in turn and measures every service against its budget.
+
+    Returns:
+        List[str]: A description of every budget that was exceeded.
+    """
+    failures = []
+    print(f"{'size':>9}  {'service':<18} {'p95 ms':>9} {'peak MB':>9}")
+    for size in sizes:
+        await project.synthetic_data.reset()
+        ids = await project.synthetic_data.generate(size, seed)
+        rng = random.Random(seed)
+        for name, call in _calls(ids, rng).items():
+            budget = BUDGETS[name]
+            if budget.max_events is not None and size > budget.max_events:
+                print(f"{size:>9}  {name:<18} {'skipped':>9}")
+                continue
+            # The first call warms up the query engine's connection pool.
+            await call()
+            # Listing returns the whole catalogue, so it gets fewer runs.
+            repeats = max(runs // 10, 2) if name.startswith("list_events") else runs
+            p95, peak = await _measure(call, repeats)
+            over = p95 > budget.p95_ms or peak > budget.peak_mb
+            print(
+                f"{size:>9}  {name:<18} {p95:>9.1f} {peak:>9.1f}"
+                f"{'  OVER BUDGET' if over else ''}"
+            )
+            if over:
+                failures.append(
+                    f"{name} at {size} events: p95 {p95:.1f}ms (budget {budget.p95_ms}ms), "
+                    f"peak {peak:.1f}MB (budget {budget.peak_mb}MB)"
+                )
+    return failures
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="confirm that every table behind DATABASE_URL may be emptied",
+    )
+    args = parser.parse_args()
+    if not args.reset:
+        parser.error(
+            "the benchmark empties every table behind DATABASE_URL; "
+            "point it at a disposable database and pass --reset"
+        )
+    db_client = prisma.Prisma(auto_register=True)
+    await db_client.connect()
+    try:
+        failures = await run(args.sizes, args.runs, args.seed)
+    finally:
+        await db_client.disconnect()
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
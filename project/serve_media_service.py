@@ -0,0 +1,227 @@
+import mimetypes
+import os
+import re
+from typing import Mapping, Optional, Tuple
+
+import anyio
+import prisma
+import prisma.enums
+import prisma.models
+import project.media_processing
+import project.media_storage
+from fastapi.responses import Response
+from starlette.types import Receive, Scope, Send
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Content types served inline. Anything else, including SVG and HTML which
+# could run script on the API origin, is sent as an attachment.
+INLINE_CONTENT_TYPES = frozenset(
+    {
+        "image/avif",
+        "image/gif",
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+        "video/mp4",
+        "video/ogg",
+        "video/quicktime",
+        "video/webm",
+    }
+)
+
+_DEFAULT_CONTENT_TYPES = {
+    prisma.enums.MediaType.IMAGE: "image/jpeg",
+    prisma.enums.MediaType.VIDEO: "video/mp4",
+    prisma.enums.MediaType.OTHER: "application/octet-stream",
+}
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class MediaFileResponse(Response):
+    """
+    Streams a byte range of a stored blob, reading it in chunks off the event loop.
+
+    The file is handed over for sendfile only when the ASGI server offers the `http.response.zerocopysend` extension. Uvicorn, which this project runs under, does not, so in practice every range goes through the chunked `pread` path.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        length: int,
+        status_code: int,
+        headers: Mapping[str, str],
+        media_type: str,
+    ) -> None:
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope["method"] == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        with open(self.path, "rb") as handle:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": handle,
+                        "offset": self.offset,
+                        "count": self.length,
+                    }
+                )
+                return
+            position = self.offset
+            remaining = self.length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(
+                    os.pread, handle.fileno(), min(self.chunk_size, remaining), position
+                )
+                if not chunk:
+                    break
+                position += len(chunk)
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b""})
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a single-range `Range` header into an inclusive byte span.
+
+    Args:
+        range_header (str): The raw header value, e.g. `bytes=0-1023` or `bytes=-500`.
+        size (int): The size of the resource in bytes.
+
+    Returns:
+        Optional[Tuple[int, int]]: The first and last byte positions, or None when the header is malformed, asks for several ranges or is an invalid range spec such as `bytes=5-3`, in which case the whole resource is served.
+
+    Raises:
+        ValueError: If the range cannot be satisfied for a resource of this size.
+    """
+    match = _RANGE_PATTERN.match(range_header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError(f"Range {range_header!r} not satisfiable.")
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(f"Range {range_header!r} not satisfiable.")
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+async def resolve_content_type(key: str) -> Optional[str]:
+    """
+    Determines the `Content-Type` of a stored blob from the media record it belongs to.
+
+    Variants are always rendered as JPEG. Originals use the content type recorded at upload time when it is in `INLINE_CONTENT_TYPES` and agrees with the recorded MediaType, falling back to the file extension and finally to a default for the MediaType. The client-supplied type is never trusted beyond that allowlist.
+
+    Args:
+        key (str): The storage key of the blob.
+
+    Returns:
+        Optional[str]: The content type, or None when no media item references the key.
+    """
+    name = os.path.splitext(os.path.basename(key))[0]
+    if name in project.media_processing.IMAGE_VARIANTS:
+        return "image/jpeg"
+    media = await prisma.models.Media.prisma().find_first(where={"storageKey": key})
+    if not media:
+        return None
+    family = {
+        prisma.enums.MediaType.IMAGE: "image/",
+        prisma.enums.MediaType.VIDEO: "video/",
+    }.get(media.type)
+    for candidate in (media.contentType, mimetypes.guess_type(key)[0]):
+        if (
+            family is not None
+            and candidate in INLINE_CONTENT_TYPES
+            and candidate.startswith(family)
+        ):
+            return candidate
+    return _DEFAULT_CONTENT_TYPES[media.type]
+
+
+async def serve_media(
+    key: str, range_header: Optional[str], if_none_match: Optional[str]
+) -> Response:
+    """
+    Endpoint for downloading stored media, with support for byte-range requests.
+
+    Stored blobs are content-addressed, so their ETag never changes and they are served with long-lived immutable cache headers. Every response carries `nosniff`, and blobs whose type is not in `INLINE_CONTENT_TYPES` are served as attachments.
+
+    Args:
+        key (str): The storage key of the blob, as it appears in the media URL.
+        range_header (Optional[str]): The `Range` request header, if any.
+        if_none_match (Optional[str]): The `If-None-Match` request header, if any.
+
+    Returns:
+        Response: The full blob (200), the requested byte range (206), a revalidation hit (304), or an error status (404, 416).
+    """
+    try:
+        path = project.media_storage.path_for(key)
+        size = os.stat(path).st_size
+    except (ValueError, OSError):
+        return Response(status_code=404)
+    content_type = await resolve_content_type(key)
+    if content_type is None:
+        return Response(status_code=404)
+    etag = f'"{key.replace("/", "-")}"'
+    headers = {
+        "accept-ranges": "bytes",
+        "cache-control": IMMUTABLE_CACHE_CONTROL,
+        "etag": etag,
+        "x-content-type-options": "nosniff",
+    }
+    if content_type not in INLINE_CONTENT_TYPES:
+        headers["content-disposition"] = "attachment"
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    span = None
+    if range_header:
+        try:
+            span = parse_range(range_header, size)
+        except ValueError:
+            headers["content-range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+    if span is None:
+        headers["content-length"] = str(size)
+        return MediaFileResponse(str(path), 0, size, 200, headers, content_type)
+    start, end = span
+    headers["content-range"] = f"bytes {start}-{end}/{size}"
+    headers["content-length"] = str(end - start + 1)
+    return MediaFileResponse(
+        str(path), start, end - start + 1, 206, headers, content_type
+    )
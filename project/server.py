@@ -5,32 +5,60 @@ from typing import List, Optional
 
 import prisma
 import prisma.enums
+import project.audit_log
 import project.authenticate_user_service
+import project.bulk_delete
+import project.bulk_delete_events_service
+import project.bulk_delete_media_service
+import project.change_feed
 import project.create_event_service
 import project.create_user_service
 import project.delete_event_service
 import project.delete_media_service
+import project.error_handling
 import project.get_event_details_service
+import project.get_feedback_analytics_service
+import project.get_profile_service
 import project.get_user_profile_service
+import project.list_audit_entries_service
 import project.list_events_service
+import project.list_profiles_service
+import project.list_user_events_service
+import project.media_processing
+import project.profiling
+import project.purge_events_service
+import project.retention
+import project.serve_media_service
+import project.stream_changes_service
 import project.submit_feedback_service
+import project.sync_changes_service
 import project.update_event_service
 import project.update_profile_service
 import project.upload_media_service
-from fastapi import FastAPI
-from fastapi.encoders import jsonable_encoder
+from fastapi import FastAPI, Header
 from fastapi.responses import Response
 from prisma import Prisma
 
 logger = logging.getLogger(__name__)
 
+# Creating the client does not start the query engine, so the app can be
+# imported once by a pre-forking master; each worker connects its own
+# client in lifespan.
 db_client = Prisma(auto_register=True)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db_client.connect()
+    project.change_feed.start_listener()
+    project.audit_log.audit_log.start()
+    project.retention.start()
     yield
+    await project.retention.stop()
+    await project.purge_events_service.shutdown()
+    await project.audit_log.audit_log.stop()
+    await project.change_feed.stop_listener()
+    await project.media_processing.shutdown()
     await db_client.disconnect()
 
 
@@ -40,28 +68,24 @@ app = FastAPI(
     description="In our Python Flask MVC application, the entry point `app.py` sets up the Flask application and imports routes from `routes.py`, which maps URL paths such as `/event/display` to `event_display_controller.py` and `/event/upload` to `event_upload_controller.py`. `event_display_controller.py` retrieves event data from `event_model.py`, which utilizes `event_dao.py` for ORM-based database operations through SQLAlchemy, and renders responses using templates like `event_display_view.html` with the Jinja2 templating engine. Conversely, `event_upload_controller.py` processes data submitted through `event_form_view.html`, also managed by `event_model.py` that handles data validation and saving. `EventDTO.py` is used to pass structured data between controllers and models, ensuring a clean data flow. Frontend interactions are managed by JavaScript files such as `event_display.js` for dynamic content updates and `event_form.js` for AJAX-based form submissions. The visual styling is consistently applied through a single CSS file, `style.css`, which styles the Jinja2 templates to ensure a uniform user interface. This adaptation maintains a clear separation of concerns with a Pythonic approach to web application architecture, integrating Flask for routing and controllers, SQLAlchemy for database interaction, and Jinja2 for rendering views, all orchestrated within the versatile and dynamic environment of Python.",
 )
 
+project.error_handling.register_error_handlers(app)
+
+app.add_middleware(project.audit_log.AuditContextMiddleware)
+
+app.add_middleware(project.profiling.ProfilingMiddleware)
+
 
 @app.post("/user/create", response_model=project.create_user_service.CreateUserResponse)
 async def api_post_create_user(
     email: str, password: str, firstName: Optional[str], lastName: Optional[str]
-) -> project.create_user_service.CreateUserResponse | Response:
+) -> project.create_user_service.CreateUserResponse:
     """
     Endpoint for user account creation.
     """
-    try:
-        res = await project.create_user_service.create_user(
-            email, password, firstName, lastName
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.create_user_service.create_user(
+        email, password, firstName, lastName
+    )
+    return res
 
 
 @app.post(
@@ -69,24 +93,14 @@ async def api_post_create_user(
 )
 async def api_post_create_event(
     title: str, description: str, date: datetime, location: str, media: List[str]
-) -> project.create_event_service.CreateEventResponse | Response:
+) -> project.create_event_service.CreateEventResponse:
     """
     Endpoint for creating a new event.
     """
-    try:
-        res = await project.create_event_service.create_event(
-            title, description, date, location, media
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.create_event_service.create_event(
+        title, description, date, location, media
+    )
+    return res
 
 
 @app.put(
@@ -99,24 +113,14 @@ async def api_put_update_profile(
     last_name: str,
     email: str,
     contact_number: Optional[str],
-) -> project.update_profile_service.UserProfileUpdateResponse | Response:
+) -> project.update_profile_service.UserProfileUpdateResponse:
     """
     Endpoint for users to update their profile information.
     """
-    try:
-        res = await project.update_profile_service.update_profile(
-            user_id, first_name, last_name, email, contact_number
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.update_profile_service.update_profile(
+        user_id, first_name, last_name, email, contact_number
+    )
+    return res
 
 
 @app.post(
@@ -125,22 +129,12 @@ async def api_put_update_profile(
 )
 async def api_post_submit_feedback(
     userId: Optional[str], content: str
-) -> project.submit_feedback_service.SubmitFeedbackResponse | Response:
+) -> project.submit_feedback_service.SubmitFeedbackResponse:
     """
     Endpoint for users to submit feedback.
     """
-    try:
-        res = await project.submit_feedback_service.submit_feedback(userId, content)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.submit_feedback_service.submit_feedback(userId, content)
+    return res
 
 
 @app.delete(
@@ -149,22 +143,12 @@ async def api_post_submit_feedback(
 )
 async def api_delete_delete_media(
     mediaId: str,
-) -> project.delete_media_service.DeleteMediaResponse | Response:
+) -> project.delete_media_service.DeleteMediaResponse:
     """
     Endpoint for deleting media from an event.
     """
-    try:
-        res = await project.delete_media_service.delete_media(mediaId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.delete_media_service.delete_media(mediaId)
+    return res
 
 
 @app.post(
@@ -173,22 +157,12 @@ async def api_delete_delete_media(
 )
 async def api_post_authenticate_user(
     email: str, password: str
-) -> project.authenticate_user_service.UserAuthenticationResponse | Response:
+) -> project.authenticate_user_service.UserAuthenticationResponse:
     """
     Endpoint for user login and authentication.
     """
-    try:
-        res = await project.authenticate_user_service.authenticate_user(email, password)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.authenticate_user_service.authenticate_user(email, password)
+    return res
 
 
 @app.delete(
@@ -197,41 +171,27 @@ async def api_post_authenticate_user(
 )
 async def api_delete_delete_event(
     eventId: str,
-) -> project.delete_event_service.DeleteEventResponse | Response:
+) -> project.delete_event_service.DeleteEventResponse:
     """
     Endpoint for deleting an event.
     """
-    try:
-        res = await project.delete_event_service.delete_event(eventId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.get("/event/list", response_model=project.list_events_service.ListEventsResponse)
-async def api_get_list_events() -> project.list_events_service.ListEventsResponse | Response:
-    """
-    Endpoint for listing all events.
-    """
-    try:
-        res = await project.list_events_service.list_events()
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.delete_event_service.delete_event(eventId)
+    return res
+
+
+@app.get(
+    "/event/list",
+    response_model=project.list_events_service.ListEventsResponse,
+    response_model_exclude_unset=True,
+)
+async def api_get_list_events(
+    fields: Optional[str] = None, include: Optional[str] = None
+) -> project.list_events_service.ListEventsResponse:
+    """
+    Endpoint for listing all events, optionally as a sparse fieldset.
+    """
+    res = await project.list_events_service.list_events(fields, include)
+    return res
 
 
 @app.post(
@@ -241,22 +201,12 @@ async def api_post_upload_media(
     eventId: str,
     media: project.upload_media_service.UploadFile,
     mediaType: prisma.enums.MediaType,
-) -> project.upload_media_service.UploadMediaResponse | Response:
+) -> project.upload_media_service.UploadMediaResponse:
     """
     Endpoint for uploading media to an event.
     """
-    try:
-        res = await project.upload_media_service.upload_media(eventId, media, mediaType)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.upload_media_service.upload_media(eventId, media, mediaType)
+    return res
 
 
 @app.put(
@@ -270,48 +220,31 @@ async def api_put_update_event(
     date: datetime,
     location: str,
     mediaContents: List[project.update_event_service.MediaContent],
-) -> project.update_event_service.UpdateEventResponse | Response:
+) -> project.update_event_service.UpdateEventResponse:
     """
     Endpoint for updating event details.
     """
-    try:
-        res = await project.update_event_service.update_event(
-            eventId, title, description, date, location, mediaContents
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.update_event_service.update_event(
+        eventId, title, description, date, location, mediaContents
+    )
+    return res
 
 
 @app.get(
     "/event/details/{eventId}",
     response_model=project.get_event_details_service.EventDetailsResponse,
+    response_model_exclude_unset=True,
 )
 async def api_get_get_event_details(
-    eventId: str,
-) -> project.get_event_details_service.EventDetailsResponse | Response:
+    eventId: str, fields: Optional[str] = None, include: Optional[str] = None
+) -> project.get_event_details_service.EventDetailsResponse:
     """
-    Endpoint for retrieving details of a specific event.
+    Endpoint for retrieving details of a specific event, optionally as a sparse fieldset.
     """
-    try:
-        res = await project.get_event_details_service.get_event_details(eventId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.get_event_details_service.get_event_details(
+        eventId, fields, include
+    )
+    return res
 
 
 @app.get(
@@ -320,19 +253,185 @@ async def api_get_get_event_details(
 )
 async def api_get_get_user_profile(
     userId: str,
-) -> project.get_user_profile_service.UserProfileResponse | Response:
+) -> project.get_user_profile_service.UserProfileResponse:
     """
     Endpoint to retrieve user profile details.
     """
-    try:
-        res = await project.get_user_profile_service.get_user_profile(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.get_user_profile_service.get_user_profile(userId)
+    return res
+
+
+@app.get(
+    "/user/{userId}/events",
+    response_model=project.list_user_events_service.UserEventsResponse,
+)
+async def api_get_list_user_events(
+    userId: str, limit: int = 20, cursor: Optional[str] = None
+) -> project.list_user_events_service.UserEventsResponse:
+    """
+    Endpoint for listing the events a user created, newest first, one page at a time.
+    """
+    res = await project.list_user_events_service.list_user_events(
+        userId, limit, cursor
+    )
+    return res
+
+
+@app.api_route("/media/file/{key:path}", methods=["GET", "HEAD"])
+async def api_get_serve_media(
+    key: str,
+    range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    Endpoint for downloading stored media, with support for byte-range requests.
+    """
+    res = await project.serve_media_service.serve_media(key, range, if_none_match)
+    return res
+
+
+@app.get("/changes/stream")
+async def api_get_stream_changes(
+    since: Optional[int] = None, last_event_id: Optional[int] = Header(None)
+) -> Response:
+    """
+    Endpoint for streaming event and media changes as server-sent events.
+    """
+    res = await project.stream_changes_service.stream_changes(
+        since if since is not None else last_event_id
+    )
+    return res
+
+
+@app.get("/sync", response_model=project.sync_changes_service.SyncChangesResponse)
+async def api_get_sync_changes(
+    since: Optional[datetime] = None,
+) -> project.sync_changes_service.SyncChangesResponse:
+    """
+    Endpoint for incrementally syncing events and media.
+    """
+    res = await project.sync_changes_service.sync_changes(since)
+    return res
+
+
+@app.get(
+    "/feedback/analytics",
+    response_model=project.get_feedback_analytics_service.FeedbackAnalyticsResponse,
+)
+async def api_get_get_feedback_analytics(
+    granularity: prisma.enums.RollupGranularity = prisma.enums.RollupGranularity.DAY,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    topUsers: int = 10,
+    x_admin_token: Optional[str] = Header(None),
+) -> project.get_feedback_analytics_service.FeedbackAnalyticsResponse:
+    """
+    Endpoint for reporting feedback volume and per-user counts. Admin only.
+    """
+    res = await project.get_feedback_analytics_service.get_feedback_analytics(
+        x_admin_token, granularity, start, end, topUsers
+    )
+    return res
+
+
+@app.get(
+    "/audit/recent",
+    response_model=project.list_audit_entries_service.AuditEntriesResponse,
+)
+async def api_get_list_audit_entries(
+    limit: int = 100,
+    entity: Optional[str] = None,
+    entityId: Optional[str] = None,
+    x_admin_token: Optional[str] = Header(None),
+) -> project.list_audit_entries_service.AuditEntriesResponse:
+    """
+    Endpoint for listing recent audit entries. Admin only.
+    """
+    res = await project.list_audit_entries_service.list_audit_entries(
+        x_admin_token, limit, entity, entityId
+    )
+    return res
+
+
+@app.post(
+    "/event/bulk-delete",
+    response_model=project.bulk_delete_events_service.BulkDeleteEventsResponse,
+)
+async def api_post_bulk_delete_events(
+    selection: project.bulk_delete.EventSelection,
+    x_admin_token: Optional[str] = Header(None),
+) -> project.bulk_delete_events_service.BulkDeleteEventsResponse:
+    """
+    Endpoint for deleting many events at once, by id list or by filter. Admin only.
+    """
+    res = await project.bulk_delete_events_service.bulk_delete_events(
+        x_admin_token, selection
+    )
+    return res
+
+
+@app.post(
+    "/media/bulk-delete",
+    response_model=project.bulk_delete_media_service.BulkDeleteMediaResponse,
+)
+async def api_post_bulk_delete_media(
+    mediaIds: List[str], x_admin_token: Optional[str] = Header(None)
+) -> project.bulk_delete_media_service.BulkDeleteMediaResponse:
+    """
+    Endpoint for deleting many media items at once. Admin only.
+    """
+    res = await project.bulk_delete_media_service.bulk_delete_media(
+        x_admin_token, mediaIds
+    )
+    return res
+
+
+@app.post(
+    "/event/purge", response_model=project.purge_events_service.PurgeJobResponse
+)
+async def api_post_start_purge(
+    selection: project.bulk_delete.EventSelection,
+    x_admin_token: Optional[str] = Header(None),
+) -> project.purge_events_service.PurgeJobResponse:
+    """
+    Endpoint for starting a throttled background purge of events. Admin only.
+    """
+    res = await project.purge_events_service.start_purge(x_admin_token, selection)
+    return res
+
+
+@app.get(
+    "/event/purge/{jobId}", response_model=project.purge_events_service.PurgeJobResponse
+)
+async def api_get_get_purge_status(
+    jobId: str, x_admin_token: Optional[str] = Header(None)
+) -> project.purge_events_service.PurgeJobResponse:
+    """
+    Endpoint for checking the progress of a background purge. Admin only.
+    """
+    res = await project.purge_events_service.get_purge_status(x_admin_token, jobId)
+    return res
+
+
+@app.get(
+    "/admin/profiles", response_model=project.list_profiles_service.ListProfilesResponse
+)
+async def api_get_list_profiles(
+    x_admin_token: Optional[str] = Header(None),
+) -> project.list_profiles_service.ListProfilesResponse:
+    """
+    Endpoint for listing recorded request profiles. Admin only.
+    """
+    res = await project.list_profiles_service.list_profiles(x_admin_token)
+    return res
+
+
+@app.get("/admin/profiles/{name}")
+async def api_get_get_profile(
+    name: str, x_admin_token: Optional[str] = Header(None)
+) -> Response:
+    """
+    Endpoint for downloading a recorded request profile. Admin only.
+    """
+    res = await project.get_profile_service.get_profile(x_admin_token, name)
+    return res
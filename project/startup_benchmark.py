@@ -0,0 +1,85 @@
+"""
+Measures how long a fresh worker takes to become ready.
+
+Run with `python -m project.startup_benchmark`. Each round starts a new interpreter, imports
+`project.server` and runs the app's lifespan startup (connecting to the database), which is
+what an autoscaled instance pays before it can serve its first request. The slowest imports
+are listed to show where the time goes. The exit status is non-zero when the median exceeds
+`STARTUP_BUDGET_SECONDS`.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "3.0"))
+
+_PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import project.server
+imported = time.perf_counter()
+async def ready():
+    async with project.server.lifespan(project.server.app):
+        return time.perf_counter()
+connected = asyncio.run(ready()) if {connect} else imported
+print(json.dumps({{"import": imported - started, "ready": connected - started}}))
+"""
+
+
+def _run_probe(connect: bool) -> Tuple[Dict[str, float], List[Tuple[int, str]]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(connect=connect)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Keep only what project.server imports directly; deeper imports are
+        # indented further below the module that pulled them in.
+        if not name.startswith("   ") or name.startswith("     "):
+            continue
+        imports.append((int(cumulative), name.strip()))
+    return json.loads(result.stdout.strip().splitlines()[-1]), imports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS)
+    parser.add_argument(
+        "--no-connect",
+        action="store_true",
+        help="only measure imports, without a database",
+    )
+    args = parser.parse_args()
+
+    timings = []
+    imports: List[Tuple[int, str]] = []
+    for _ in range(args.rounds):
+        timing, imports = _run_probe(connect=not args.no_connect)
+        timings.append(timing)
+
+    import_median = statistics.median(timing["import"] for timing in timings)
+    ready_median = statistics.median(timing["ready"] for timing in timings)
+    print(f"import project.server: {import_median:.3f}s (median of {args.rounds})")
+    print(f"ready to serve:        {ready_median:.3f}s (budget {args.budget:.3f}s)")
+    print("slowest imports made by project.server (cumulative):")
+    for cumulative, name in sorted(imports, reverse=True)[:10]:
+        print(f"  {cumulative / 1e6:8.3f}s  {name}")
+    if ready_median > args.budget:
+        print("startup exceeds budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import asyncio
+from typing import AsyncIterator, Optional, Set
+
+import project.change_feed
+from fastapi.responses import StreamingResponse
+
+HEARTBEAT_SECONDS = 15
+
+
+def _format_event(change: project.change_feed.Change) -> str:
+    return (
+        f"id: {change.seq}\n"
+        f"event: {change.entity}.{change.action}\n"
+        f"data: {change.json()}\n\n"
+    )
+
+
+async def _event_stream(since: Optional[int]) -> AsyncIterator[str]:
+    async with project.change_feed.hub.subscribe() as queue:
+        yield "retry: 3000\n\n"
+        replayed: Set[int] = set()
+        if since is not None:
+            for change in await project.change_feed.late_changes(since):
+                replayed.add(change.seq)
+                yield _format_event(change)
+        while since is not None:
+            backlog = await project.change_feed.changes_since(since)
+            for change in backlog:
+                replayed.add(change.seq)
+                yield _format_event(change)
+            if not backlog:
+                break
+            since = backlog[-1].seq
+        while True:
+            try:
+                change = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if change is None:
+                return
+            if change.seq in replayed:
+                continue
+            yield _format_event(change)
+
+
+async def stream_changes(since: Optional[int]) -> StreamingResponse:
+    """
+    Endpoint for streaming event and media changes as server-sent events.
+
+    The subscription is opened before the backlog is read, so nothing committed while catching up is missed; changes already sent from the backlog are skipped when they arrive live.
+
+    Sequence numbers are not commit-ordered, so on resume the changes numbered just below the cursor are replayed as well (see `change_feed.late_changes`). Delivery is at least once and not strictly in sequence order; clients should skip sequence numbers they have already applied.
+
+    Args:
+        since (Optional[int]): Sequence number of the last change the client has seen, taken from `?since=` or the `Last-Event-ID` header. When omitted only new changes are streamed.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response that stays open until the client disconnects or falls too far behind.
+
+    Raises:
+        GoneError: If `since` is older than the retained change history.
+    """
+    if since is not None:
+        await project.change_feed.ensure_resumable(since)
+    return StreamingResponse(
+        _event_stream(since),
+        media_type="text/event-stream",
+        headers={"cache-control": "no-cache", "x-accel-buffering": "no"},
+    )
@@ -2,6 +2,7 @@ from typing import Optional
 
 import prisma
 import prisma.models
+import project.feedback_rollups
 from pydantic import BaseModel
 
 
@@ -21,6 +22,8 @@ async def submit_feedback(
     """
     Endpoint for users to submit feedback.
 
+    The feedback rollups used for analytics are updated in the same transaction.
+
     Args:
         userId (Optional[str]): Optional userId to identify the user submitting feedback.
         content (str): The content of the feedback provided by the user.
@@ -28,16 +31,13 @@ async def submit_feedback(
     Returns:
         SubmitFeedbackResponse: Confirms the successful submission of feedback, including the ID of the newly created feedback entry.
     """
-    try:
-        feedback_entry = await prisma.models.Feedback.prisma().create(
+    async with prisma.get_client().tx() as transaction:
+        feedback_entry = await prisma.models.Feedback.prisma(transaction).create(
             data={"content": content, "userId": userId if userId else None}
         )
-        return SubmitFeedbackResponse(
-            success=True,
-            feedbackId=feedback_entry.id,
-            message="Your feedback has been submitted successfully.",
-        )
-    except Exception as e:
-        return SubmitFeedbackResponse(
-            success=False, feedbackId="", message=f"Failed to submit feedback: {str(e)}"
-        )
+        await project.feedback_rollups.increment_rollups(transaction, feedback_entry)
+    return SubmitFeedbackResponse(
+        success=True,
+        feedbackId=feedback_entry.id,
+        message="Your feedback has been submitted successfully.",
+    )
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.errors
+import project.tombstones
+from pydantic import BaseModel
+
+# Rows are stamped by the writing worker, so a write that commits slightly
+# after a sync started may carry an earlier timestamp. Handing out a
+# watermark this far in the past makes the next sync pick such rows up;
+# clients apply changes by id, so receiving a row twice is harmless.
+WATERMARK_LAG = timedelta(seconds=5)
+
+
+class SyncMediaVariant(BaseModel):
+    """
+    A resized rendition of a media item.
+    """
+
+    name: str
+    url: str
+    width: int
+    height: int
+
+
+class SyncMedia(BaseModel):
+    """
+    A media item created or updated after the requested watermark.
+    """
+
+    id: str
+    eventId: str
+    type: prisma.enums.MediaType
+    url: str
+    variants: List[SyncMediaVariant]
+    updatedAt: datetime
+
+
+class SyncEvent(BaseModel):
+    """
+    An event created or updated after the requested watermark. Its media are reported separately.
+    """
+
+    id: str
+    title: str
+    description: str
+    date: datetime
+    location: str
+    updatedAt: datetime
+
+
+class SyncTombstone(BaseModel):
+    """
+    A record removed after the requested watermark, which the client should drop.
+    """
+
+    entity: str
+    id: str
+    parentId: Optional[str] = None
+    deletedAt: datetime
+
+
+class SyncChangesResponse(BaseModel):
+    """
+    The changes since the requested watermark, along with the watermark to pass on the next sync.
+    """
+
+    events: List[SyncEvent]
+    media: List[SyncMedia]
+    tombstones: List[SyncTombstone]
+    watermark: datetime
+
+
+async def sync_changes(since: Optional[datetime]) -> SyncChangesResponse:
+    """
+    Endpoint for incrementally syncing events and media.
+
+    Args:
+        since (Optional[datetime]): The watermark returned by the previous sync. When omitted, every event and media item is returned and no tombstones are sent.
+
+    Returns:
+        SyncChangesResponse: The changes since the requested watermark, along with the watermark to pass on the next sync.
+
+    Raises:
+        GoneError: If `since` is older than `TOMBSTONE_RETENTION`, so deletions may have been pruned.
+    """
+    if since and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    oldest = datetime.now(timezone.utc) - project.tombstones.TOMBSTONE_RETENTION
+    if since and since < oldest:
+        raise project.errors.GoneError(
+            "Watermark is older than the retained tombstones; sync again without it."
+        )
+    watermark = datetime.now(timezone.utc) - WATERMARK_LAG
+    changed = {"updatedAt": {"gt": since}} if since else {}
+    events = await prisma.models.Event.prisma().find_many(where=changed)
+    media = await prisma.models.Media.prisma().find_many(
+        where=changed, include={"Variants": True}
+    )
+    tombstones = []
+    if since:
+        tombstones = await prisma.models.Tombstone.prisma().find_many(
+            where={"deletedAt": {"gt": since}}
+        )
+    return SyncChangesResponse(
+        events=[
+            SyncEvent(
+                id=event.id,
+                title=event.title,
+                description=event.description,
+                date=event.date,
+                location=event.location,
+                updatedAt=event.updatedAt,
+            )
+            for event in events
+        ],
+        media=[
+            SyncMedia(
+                id=item.id,
+                eventId=item.eventId,
+                type=item.type,
+                url=item.url,
+                variants=[
+                    SyncMediaVariant(
+                        name=variant.name,
+                        url=variant.url,
+                        width=variant.width,
+                        height=variant.height,
+                    )
+                    for variant in item.Variants
+                ],
+                updatedAt=item.updatedAt,
+            )
+            for item in media
+        ],
+        tombstones=[
+            SyncTombstone(
+                entity=tombstone.entity,
+                id=tombstone.entityId,
+                parentId=tombstone.parentId,
+                deletedAt=tombstone.deletedAt,
+            )
+            for tombstone in tombstones
+        ],
+        watermark=watermark,
+    )
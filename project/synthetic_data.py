@@ -0,0 +1,187 @@
+"""
+Bulk-loads a synthetic but realistically shaped data set for scaling tests.
+
+Run with `python -m project.synthetic_data --events 100000 --reset`. The number of events sets
+the scale; users, profiles, media and feedback are derived from it:
+
+* one user per ten events, nine in ten with a profile;
+* event creators follow a Zipf-like distribution, so a few users own many events;
+* zero to five media items per event, averaging 1.5, one in five a video;
+* half as many feedback entries as events, a third of them anonymous.
+
+Rows are written with `create_many` in chunks, and the feedback rollups and cached event counts
+are rebuilt afterwards.
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import bcrypt
+import prisma
+import prisma.models
+import project.feedback_rollups
+import project.user_counts
+
+CHUNK_SIZE = 5000
+
+_TABLES = [
+    "AuditEntry",
+    "ChangeEvent",
+    "FeedbackRollup",
+    "FeedbackUserRollup",
+    "Feedback",
+    "MediaVariant",
+    "Media",
+    "Event",
+    "Profile",
+    "PurgeJob",
+    "Tombstone",
+    "User",
+]
+
+# Relative frequency of events with 0, 1, ... 5 media items; the mean is 1.49.
+_MEDIA_COUNT_WEIGHTS = [28, 30, 20, 12, 7, 3]
+
+_WORDS = (
+    "annual summer open community tech music art food market night charity "
+    "workshop festival meetup conference gala fair tour session retreat"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _id(rng: random.Random) -> str:
+    return uuid.UUID(int=rng.getrandbits(128)).hex
+
+
+async def _insert(model: Any, rows: List[Dict[str, Any]]) -> None:
+    for start in range(0, len(rows), CHUNK_SIZE):
+        await model.prisma().create_many(data=rows[start : start + CHUNK_SIZE])
+
+
+async def reset() -> None:
+    """
+    Removes all rows from every table.
+    """
+    tables = ", ".join(f'"{table}"' for table in _TABLES)
+    await prisma.get_client().execute_raw(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
+
+async def generate(events: int, seed: int = 0) -> Dict[str, List[str]]:
+    """
+    Loads a synthetic data set with `events` events and proportional users, profiles, media and feedback.
+
+    Args:
+        events (int): The number of events to create.
+        seed (int): Seed for the random generator, so runs are reproducible.
+
+    Returns:
+        Dict[str, List[str]]: Identifiers of the created users, users with a profile and events, for picking benchmark inputs.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    password = bcrypt.hashpw(b"synthetic", bcrypt.gensalt()).decode("utf-8")
+
+    user_ids = [_id(rng) for _ in range(max(events // 10, 1))]
+    await _insert(
+        prisma.models.User,
+        [
+            {"id": user_id, "email": f"{user_id}@example.com", "password": password}
+            for user_id in user_ids
+        ],
+    )
+    profiled = [user_id for user_id in user_ids if rng.random() < 0.9]
+    await _insert(
+        prisma.models.Profile,
+        [
+            {
+                "userId": user_id,
+                "firstName": rng.choice(_WORDS).capitalize(),
+                "lastName": rng.choice(_WORDS).capitalize(),
+            }
+            for user_id in profiled
+        ],
+    )
+
+    # Rows are generated and inserted a chunk at a time, so memory use does
+    # not grow with the scale.
+    creator_weights = [1 / (rank + 1) for rank in range(len(user_ids))]
+    event_ids = []
+    for start in range(0, events, CHUNK_SIZE):
+        event_rows = []
+        media_rows = []
+        count = min(CHUNK_SIZE, events - start)
+        for creator in rng.choices(user_ids, weights=creator_weights, k=count):
+            event_id = _id(rng)
+            event_ids.append(event_id)
+            event_rows.append(
+                {
+                    "id": event_id,
+                    "title": _sentence(rng, 3),
+                    "description": _sentence(rng, rng.randint(20, 80)),
+                    "date": now + timedelta(days=rng.uniform(-730, 365)),
+                    "location": _sentence(rng, 2),
+                    "createdBy": creator,
+                    "createdAt": now - timedelta(days=rng.uniform(0, 730)),
+                }
+            )
+            media_count = rng.choices(
+                range(len(_MEDIA_COUNT_WEIGHTS)), weights=_MEDIA_COUNT_WEIGHTS
+            )[0]
+            for _ in range(media_count):
+                video = rng.random() < 0.2
+                media_rows.append(
+                    {
+                        "eventId": event_id,
+                        "type": "VIDEO" if video else "IMAGE",
+                        "url": f"https://example.com/{_id(rng)}.{'mp4' if video else 'jpg'}",
+                    }
+                )
+        await _insert(prisma.models.Event, event_rows)
+        await _insert(prisma.models.Media, media_rows)
+
+    for start in range(0, events // 2, CHUNK_SIZE):
+        await _insert(
+            prisma.models.Feedback,
+            [
+                {
+                    "content": _sentence(rng, rng.randint(5, 40)),
+                    "userId": None if rng.random() < 1 / 3 else rng.choice(user_ids),
+                    "createdAt": now - timedelta(days=rng.uniform(0, 90)),
+                }
+                for _ in range(min(CHUNK_SIZE, events // 2 - start))
+            ],
+        )
+    await project.feedback_rollups.rebuild_rollups()
+    await project.user_counts.rebuild_event_counts()
+    return {
+        "users": user_ids,
+        "profiled": profiled,
+        "events": event_ids,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", action="store_true", help="empty all tables first")
+    args = parser.parse_args()
+    db_client = prisma.Prisma(auto_register=True)
+    await db_client.connect()
+    try:
+        if args.reset:
+            await reset()
+        await generate(args.events, args.seed)
+    finally:
+        await db_client.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
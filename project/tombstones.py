@@ -0,0 +1,62 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import prisma
+import prisma.models
+
+TOMBSTONE_RETENTION = timedelta(
+    days=float(os.environ.get("TOMBSTONE_RETENTION_DAYS", "30"))
+)
+
+PRUNE_BATCH_SIZE = 1000
+
+_PRUNE_TOMBSTONES = """
+DELETE FROM "Tombstone" WHERE "id" IN (
+    SELECT "id" FROM "Tombstone" WHERE "deletedAt" < $1 LIMIT $2
+)
+"""
+
+
+async def record_tombstones(
+    client: prisma.Prisma,
+    entity: str,
+    entityIds: List[str],
+    parentId: Optional[str] = None,
+) -> None:
+    """
+    Records that rows were removed so that delta sync can report the deletions.
+
+    Call this inside the same transaction as the delete, including for rows removed by a cascade, which otherwise leave no trace.
+
+    Args:
+        client (prisma.Prisma): The client or transaction to write through.
+        entity (str): The kind of record that was removed, `event` or `media`.
+        entityIds (List[str]): Identifiers of the removed records.
+        parentId (Optional[str]): Identifier of the owning event for media rows.
+    """
+    if not entityIds:
+        return
+    await prisma.models.Tombstone.prisma(client).create_many(
+        data=[
+            {"entity": entity, "entityId": entityId, "parentId": parentId}
+            for entityId in entityIds
+        ]
+    )
+
+
+async def prune_tombstones(before: datetime) -> int:
+    """
+    Deletes tombstones recorded before `before`, a batch at a time.
+
+    Returns:
+        int: The number of tombstones deleted.
+    """
+    deleted = 0
+    while True:
+        count = await prisma.get_client().execute_raw(
+            _PRUNE_TOMBSTONES, before, PRUNE_BATCH_SIZE
+        )
+        deleted += count
+        if count < PRUNE_BATCH_SIZE:
+            return deleted
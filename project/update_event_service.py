@@ -4,6 +4,11 @@ from typing import List
 import prisma
 import prisma.enums
 import prisma.models
+import project.audit_log
+import project.change_feed
+import project.errors
+import project.media_storage
+import project.tombstones
 from pydantic import BaseModel
 
 
@@ -48,11 +53,14 @@ async def update_event(
 
     Returns:
         UpdateEventResponse: Response model for the event update operation, indicating success and returning the updated event details.
+
+    Raises:
+        NotFoundError: If no event with the given `eventId` exists.
     """
     updatedFields = []
     event = await prisma.models.Event.prisma().find_unique(where={"id": eventId})
     if not event:
-        return UpdateEventResponse(success=False, eventId=eventId, updatedFields=[])
+        raise project.errors.NotFoundError(f"Event with id {eventId} not found.")
     await prisma.models.Event.prisma().update(
         where={"id": eventId},
         data={
@@ -64,16 +72,32 @@ async def update_event(
     )
     updatedFields.extend(["title", "description", "date", "location"])
     if mediaContents:
-        await prisma.models.Media.prisma().delete_many(where={"eventId": eventId})
-        for media_content in mediaContents:
-            await prisma.models.Media.prisma().create(
-                data={
-                    "type": media_content.type,
-                    "url": media_content.url,
-                    "eventId": eventId,
-                }
+        async with prisma.get_client().tx() as transaction:
+            replaced = await prisma.models.Media.prisma(transaction).find_many(
+                where={"eventId": eventId}
+            )
+            await prisma.models.Media.prisma(transaction).delete_many(
+                where={"eventId": eventId}
+            )
+            await project.tombstones.record_tombstones(
+                transaction, "media", [media.id for media in replaced], eventId
+            )
+            await prisma.models.Media.prisma(transaction).create_many(
+                data=[
+                    {
+                        "type": media_content.type,
+                        "url": media_content.url,
+                        "eventId": eventId,
+                    }
+                    for media_content in mediaContents
+                ]
             )
+        await project.media_storage.remove_unreferenced(
+            media.storageKey for media in replaced
+        )
         updatedFields.append("mediaContents")
+    await project.change_feed.record_change("event", "updated", eventId)
+    project.audit_log.audit_log.record("updated", "event", eventId)
     return UpdateEventResponse(
         success=True, eventId=eventId, updatedFields=updatedFields
     )
@@ -2,6 +2,7 @@ from typing import Any, Dict, Optional
 
 import prisma
 import prisma.models
+import project.errors
 from pydantic import BaseModel
 
 
@@ -37,11 +38,21 @@ async def update_profile(
         UserProfileUpdateResponse: The response model returning the outcome of a user profile update attempt, including any new or unchanged data.
 
     Raises:
-        ValueError: If the specified `user_id` does not exist.
+        NotFoundError: If the specified `user_id` does not exist.
+        ConflictError: If `email` is already used by another account.
     """
     user = await prisma.models.User.prisma().find_unique(where={"id": user_id})
     if user is None:
-        raise ValueError(f"User with id {user_id} does not exist.")
+        raise project.errors.NotFoundError(f"User with id {user_id} does not exist.")
+    # Checked before anything is written, so a conflict leaves the profile unchanged.
+    if email != user.email:
+        existing_email = await prisma.models.User.prisma().find_unique(
+            where={"email": email}
+        )
+        if existing_email:
+            raise project.errors.ConflictError(
+                "Email already in use, please choose a different one."
+            )
     updated_fields = {}
     profile = await prisma.models.Profile.prisma().find_unique(
         where={"userId": user_id}
@@ -57,21 +68,10 @@ async def update_profile(
             where={"userId": user_id}, data={**updated_fields}
         )
     if email != user.email:
-        existing_email = await prisma.models.User.prisma().find_unique(
-            where={"email": email}
+        await prisma.models.User.prisma().update(
+            where={"id": user_id}, data={"email": email}
         )
-        if existing_email:
-            return UserProfileUpdateResponse(
-                success=False,
-                user_id=user_id,
-                message="Email already in use, please choose a different one.",
-                updated_fields={},
-            )
-        else:
-            await prisma.models.User.prisma().update(
-                where={"id": user_id}, data={"email": email}
-            )
-            updated_fields["email"] = email
+        updated_fields["email"] = email
     return UserProfileUpdateResponse(
         success=True,
         user_id=user_id,
@@ -1,6 +1,10 @@
 import prisma
 import prisma.enums
 import prisma.models
+import project.audit_log
+import project.change_feed
+import project.media_processing
+import project.media_storage
 from pydantic import BaseModel
 
 
@@ -29,6 +33,9 @@ async def upload_media(
     """
     Endpoint for uploading media to an event.
 
+    The original is written to the content-addressed media store and resized variants
+    are rendered in the background once the media record exists.
+
     Args:
         eventId (str): Identifier for the event to which the media belongs.
         media (UploadFile): The multimedia file to be uploaded.
@@ -37,10 +44,21 @@ async def upload_media(
     Returns:
         UploadMediaResponse: Response payload confirming the successful media upload.
     """
-    media_url = f"https://yourmediastorage.url/{media.filename}"
+    stored = await project.media_storage.store_original(media.content, media.filename)
     created_media = await prisma.models.Media.prisma().create(
-        data={"type": mediaType, "url": media_url, "eventId": eventId}
+        data={
+            "type": mediaType,
+            "url": project.media_storage.url_for(stored.key),
+            "storageKey": stored.key,
+            "contentType": media.content_type,
+            "eventId": eventId,
+        }
+    )
+    await project.change_feed.record_change(
+        "media", "created", created_media.id, eventId
     )
+    project.audit_log.audit_log.record("created", "media", created_media.id)
+    project.media_processing.schedule_variants(created_media.id, stored.key, mediaType)
     return UploadMediaResponse(
         mediaId=created_media.id, message="prisma.models.Media uploaded successfully."
     )
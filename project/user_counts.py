@@ -0,0 +1,60 @@
+import asyncio
+from collections import Counter
+from typing import Iterable
+
+import prisma
+
+_ADJUST_EVENT_COUNTS = """
+UPDATE "User" AS u SET "eventCount" = u."eventCount" + d.delta
+FROM unnest($1::text[], $2::int[]) AS d (id, delta)
+WHERE u."id" = d.id
+"""
+
+_REBUILD_EVENT_COUNTS = """
+UPDATE "User" AS u SET "eventCount" = COALESCE(
+    (SELECT count(*) FROM "Event" AS e WHERE e."createdBy" = u."id"), 0
+)
+"""
+
+
+async def adjust_event_counts(
+    client: prisma.Prisma, creators: Iterable[str], delta: int
+) -> None:
+    """
+    Moves the cached `eventCount` of each creator by `delta` per event, in one statement.
+
+    Call this in the transaction that creates or deletes the events.
+
+    Args:
+        client (prisma.Prisma): The client or transaction to write through.
+        creators (Iterable[str]): The `createdBy` of every affected event; a user listed twice is adjusted twice.
+        delta (int): `1` for created events, `-1` for deleted ones.
+    """
+    totals = Counter(creators)
+    if not totals:
+        return
+    await client.execute_raw(
+        _ADJUST_EVENT_COUNTS,
+        list(totals),
+        [count * delta for count in totals.values()],
+    )
+
+
+async def rebuild_event_counts() -> None:
+    """
+    Recomputes every user's cached `eventCount` from the events table, as a one-off backfill.
+    """
+    await prisma.get_client().execute_raw(_REBUILD_EVENT_COUNTS)
+
+
+async def main() -> None:
+    db_client = prisma.Prisma(auto_register=True)
+    await db_client.connect()
+    try:
+        await rebuild_event_counts()
+    finally:
+        await db_client.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import project.audit_log
+from project.audit_log import AuditLog
+
+
+def _buffer_of(size: int) -> AuditLog:
+    with mock.patch.object(project.audit_log, "AUDIT_BUFFER_SIZE", size):
+        return AuditLog("postgres")
+
+
+def _ids(log: AuditLog):
+    return [entry.entityId for entry in log._buffer]
+
+
+@mock.patch.object(project.audit_log, "AUDIT_BATCH_SIZE", 2)
+class AuditLogTest(unittest.TestCase):
+    def test_overflow_drops_oldest(self):
+        log = _buffer_of(3)
+        for entityId in "abcde":
+            log.record("created", "event", entityId)
+        self.assertEqual(log.buffered, 3)
+        self.assertEqual(log.dropped, 2)
+        self.assertEqual(_ids(log), ["c", "d", "e"])
+
+    def test_flush_writes_in_batches(self):
+        log = _buffer_of(10)
+        for entityId in "abc":
+            log.record("created", "event", entityId)
+        batches = []
+
+        async def write(batch):
+            batches.append([entry.entityId for entry in batch])
+
+        with mock.patch.object(log, "_write", write):
+            asyncio.run(log.flush())
+        self.assertEqual(batches, [["a", "b"], ["c"]])
+        self.assertEqual(log.flushed, 3)
+        self.assertEqual(log.buffered, 0)
+
+    def test_failed_write_requeues_batch(self):
+        log = _buffer_of(10)
+        for entityId in "abc":
+            log.record("created", "event", entityId)
+
+        async def write(batch):
+            raise ConnectionError("sink is down")
+
+        with mock.patch.object(log, "_write", write), self.assertLogs(
+            "project.audit_log"
+        ):
+            asyncio.run(log.flush())
+        self.assertEqual(_ids(log), ["a", "b", "c"])
+        self.assertEqual(log.flushed, 0)
+        self.assertEqual(log.dropped, 0)
+
+    def test_failed_write_counts_what_no_longer_fits(self):
+        log = _buffer_of(3)
+        for entityId in "abc":
+            log.record("created", "event", entityId)
+
+        async def write(batch):
+            # Entries recorded while the write is in flight take up the room.
+            log.record("created", "event", "d")
+            raise ConnectionError("sink is down")
+
+        with mock.patch.object(log, "_write", write), self.assertLogs(
+            "project.audit_log"
+        ):
+            asyncio.run(log.flush())
+        self.assertEqual(_ids(log), ["b", "c", "d"])
+        self.assertEqual(log.dropped, 1)
@@ -0,0 +1,46 @@
+import unittest
+
+from project.errors import DomainError
+from project.event_fields import EVENT_FIELDS, EventFieldSelection
+
+
+class EventFieldSelectionParseTest(unittest.TestCase):
+    def test_defaults_to_full_event(self):
+        selection = EventFieldSelection.parse()
+        self.assertEqual(selection.fields, list(EVENT_FIELDS))
+        self.assertTrue(selection.media)
+        self.assertTrue(selection.variants)
+
+    def test_fields_without_include_leave_out_media(self):
+        selection = EventFieldSelection.parse("title,date")
+        self.assertEqual(selection.fields, ["id", "title", "date"])
+        self.assertFalse(selection.media)
+        self.assertFalse(selection.variants)
+
+    def test_fields_keep_schema_order(self):
+        selection = EventFieldSelection.parse("location, title")
+        self.assertEqual(selection.fields, ["id", "title", "location"])
+
+    def test_empty_fields_return_only_id(self):
+        selection = EventFieldSelection.parse("")
+        self.assertEqual(selection.fields, ["id"])
+        self.assertFalse(selection.media)
+
+    def test_include_without_fields_keeps_every_field(self):
+        selection = EventFieldSelection.parse(None, "media")
+        self.assertEqual(selection.fields, list(EVENT_FIELDS))
+        self.assertTrue(selection.media)
+        self.assertFalse(selection.variants)
+
+    def test_include_variants(self):
+        selection = EventFieldSelection.parse("id", "media,media.variants")
+        self.assertTrue(selection.media)
+        self.assertTrue(selection.variants)
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaises(DomainError):
+            EventFieldSelection.parse("title,createdBy")
+
+    def test_unknown_include_is_rejected(self):
+        with self.assertRaises(DomainError):
+            EventFieldSelection.parse("title", "user")
@@ -0,0 +1,46 @@
+import base64
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from project.errors import DomainError
+from project.list_user_events_service import _decode_cursor, _encode_cursor
+
+
+def _cursor(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+class CursorTest(unittest.TestCase):
+    def test_round_trip(self):
+        createdAt = datetime(2024, 4, 27, 19, 36, 38, 263164, tzinfo=timezone.utc)
+        event = SimpleNamespace(createdAt=createdAt, id="clvh1c2xk0000")
+        self.assertEqual(
+            _decode_cursor(_encode_cursor(event)),
+            {"createdAt": createdAt, "id": "clvh1c2xk0000"},
+        )
+
+    def test_round_trip_keeps_separator_in_id(self):
+        createdAt = datetime(2024, 4, 27, tzinfo=timezone.utc)
+        event = SimpleNamespace(createdAt=createdAt, id="a|b")
+        self.assertEqual(_decode_cursor(_encode_cursor(event))["id"], "a|b")
+
+    def test_invalid_base64_is_rejected(self):
+        with self.assertRaises(DomainError):
+            _decode_cursor("abc")
+
+    def test_non_ascii_cursor_is_rejected(self):
+        with self.assertRaises(DomainError):
+            _decode_cursor("é")
+
+    def test_non_utf8_payload_is_rejected(self):
+        with self.assertRaises(DomainError):
+            _decode_cursor(_cursor(b"\xff\xfe|id"))
+
+    def test_missing_separator_is_rejected(self):
+        with self.assertRaises(DomainError):
+            _decode_cursor(_cursor(b"2024-04-27T00:00:00+00:00"))
+
+    def test_invalid_timestamp_is_rejected(self):
+        with self.assertRaises(DomainError):
+            _decode_cursor(_cursor(b"yesterday|id"))
@@ -0,0 +1,50 @@
+import unittest
+
+from project.serve_media_service import parse_range
+
+
+class ParseRangeTest(unittest.TestCase):
+    def test_closed_range(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+
+    def test_open_ended_range(self):
+        self.assertEqual(parse_range("bytes=900-", 1000), (900, 999))
+
+    def test_end_is_clamped_to_size(self):
+        self.assertEqual(parse_range("bytes=900-5000", 1000), (900, 999))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+
+    def test_suffix_longer_than_resource(self):
+        self.assertEqual(parse_range("bytes=-5000", 1000), (0, 999))
+
+    def test_malformed_header_is_ignored(self):
+        self.assertIsNone(parse_range("items=0-99", 1000))
+        self.assertIsNone(parse_range("bytes=-", 1000))
+
+    def test_multiple_ranges_are_ignored(self):
+        self.assertIsNone(parse_range("bytes=0-9,20-29", 1000))
+
+    def test_invalid_range_spec_is_ignored(self):
+        self.assertIsNone(parse_range("bytes=5-3", 1000))
+
+    def test_start_past_end_is_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            parse_range("bytes=1000-", 1000)
+
+    def test_empty_suffix_is_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            parse_range("bytes=-0", 1000)
+
+    def test_suffix_of_empty_resource_is_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            parse_range("bytes=-10", 0)
+
+    def test_any_range_of_empty_resource_is_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            parse_range("bytes=0-", 0)
+
+
+if __name__ == "__main__":
+    unittest.main()